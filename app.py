@@ -1,14 +1,37 @@
+import os
+
 import dash
+from components import config
+from components.helpers.dataset import get_dataset_handle
+from components.helpers.serialization import enable_fast_json
+from components.helpers.warmup import start_warmup
 from components.layout import layout
+from components.server import configure_server
 from components.callbacks.callbacks import register_callbacks
 
+if config.FAST_JSON:
+    enable_fast_json()
+
 app = dash.Dash(__name__, assets_folder="assets", suppress_callback_exceptions=True)
 app.title = "AEID"
+configure_server(app)
 app.layout = layout
 register_callbacks(app)
 
+# Load the dataset at startup rather than on the first request
+dataset = get_dataset_handle()
+dataset.frame
+
 # Expose the server for Gunicorn
 server = app.server
 
 if __name__ == "__main__":
+    # debug=True runs this file twice: in werkzeug's reloader and in the
+    # server process it starts (WERKZEUG_RUN_MAIN). Only the server needs the
+    # watcher and warm caches; under Gunicorn see gunicorn.conf.py
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        if config.RELOAD_INTERVAL:
+            dataset.start_watcher(config.RELOAD_INTERVAL)
+        if config.WARMUP:
+            start_warmup(app, config.WARMUP_STATES)
     app.run(debug=True)
\ No newline at end of file
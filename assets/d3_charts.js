@@ -0,0 +1,441 @@
+// D3 charts shared by the Overview, Nutrients and Water pages.
+// d3 itself is served locally from assets/vendor/; the page callbacks only
+// call into window.dashboardCharts with their store data.
+//
+// Each container keeps one persistent chart: the SVG, axes and scales are
+// created once and later updates join the new data onto the existing nodes
+// (enter/update/exit with transitions). All charts share a single tooltip.
+window.dashboardCharts = (function() {
+
+    const DURATION = 750;
+    const charts = {};
+    let tooltip = null;
+
+    function getTooltip() {
+        if (!tooltip || !document.body.contains(tooltip.node())) {
+            tooltip = d3.select('body').append('div')
+                .attr('class', 'd3-tooltip')
+                .style('position', 'absolute')
+                .style('visibility', 'hidden')
+                .style('background-color', 'rgba(0, 0, 0, 0.9)')
+                .style('color', 'white')
+                .style('padding', '10px')
+                .style('border-radius', '6px')
+                .style('font-size', '13px')
+                .style('font-family', 'Inter, sans-serif')
+                .style('box-shadow', '0 4px 8px rgba(0, 0, 0, 0.3)')
+                .style('z-index', '1000')
+                .style('pointer-events', 'none')
+                .style('max-width', '220px');
+        }
+        return tooltip;
+    }
+
+    function bindTooltip(selection, html) {
+        selection
+            .on('mouseover.tooltip', (event, d) => {
+                getTooltip().html(html(d)).style('visibility', 'visible');
+            })
+            .on('mousemove.tooltip', event => {
+                getTooltip()
+                    .style('top', (event.pageY - 20) + 'px')
+                    .style('left', (event.pageX + 10) + 'px');
+            })
+            .on('mouseout.tooltip', () => getTooltip().style('visibility', 'hidden'));
+    }
+
+    // Return the chart for `containerId`, creating it with `setup` when the
+    // container is new (first render, or Dash re-mounted the page).
+    function getChart(containerId, margin, setup) {
+        const node = document.getElementById(containerId);
+        if (!node) {
+            return null;
+        }
+        let chart = charts[containerId];
+        if (!chart || chart.node !== node) {
+            const container = d3.select(node);
+            container.selectAll('*').remove();
+
+            chart = {node: node, margin: margin};
+            chart.message = container.append('div')
+                .style('display', 'none')
+                .style('justify-content', 'center')
+                .style('align-items', 'center')
+                .style('height', '100%');
+            chart.svg = container.append('svg');
+            chart.g = chart.svg.append('g')
+                .attr('transform', `translate(${margin.left},${margin.top})`);
+            setup(chart);
+            charts[containerId] = chart;
+        }
+        return chart;
+    }
+
+    function showMessage(chart, message, color) {
+        chart.svg.style('display', 'none');
+        chart.message
+            .style('display', 'flex')
+            .style('color', color || '#fff')
+            .style('font-family', 'Inter, sans-serif')
+            .text(message);
+    }
+
+    function resize(chart, minWidth, height) {
+        chart.message.style('display', 'none');
+        chart.svg.style('display', null);
+        const width = Math.max(minWidth || 0,
+            chart.node.getBoundingClientRect().width - chart.margin.left - chart.margin.right);
+        chart.svg
+            .attr('width', width + chart.margin.left + chart.margin.right)
+            .attr('height', height + chart.margin.top + chart.margin.bottom);
+        return width;
+    }
+
+    function shrinkToBaseline(exit, t, height) {
+        exit.transition(t)
+            .attr('y', height)
+            .attr('height', 0)
+            .remove();
+    }
+
+    // Overview: normalized nutrient balance per country
+    function overviewBars(containerId, data) {
+        data = window.dashboardPayloads.toRecords(data);
+        const height = 350;
+
+        const chart = getChart(containerId, {top: 40, right: 40, bottom: 100, left: 80}, chart => {
+            chart.x = d3.scaleBand().padding(0.2);
+            chart.y = d3.scaleLinear().range([height, 0]);
+            chart.bars = chart.g.append('g');
+            chart.xAxis = chart.g.append('g').attr('transform', `translate(0,${height})`);
+            chart.yAxis = chart.g.append('g');
+        });
+        if (!chart) {
+            return "0";
+        }
+
+        // ✅ Safety: Exit early if no data
+        if (!data || !Array.isArray(data) || data.length === 0) {
+            showMessage(chart, 'No data available');
+            return "0";
+        }
+
+        // ✅ Sort descending by normalized_value
+        data.sort((a, b) => b.normalized_value - a.normalized_value);
+
+        const width = resize(chart, 0, height);
+        const t = chart.svg.transition().duration(DURATION);
+        const x = chart.x.domain(data.map(d => d.country)).range([0, width]);
+        const y = chart.y.domain([0, d3.max(data, d => d.normalized_value) * 1.1]).nice();
+        const color = d3.scaleSequential(d3.interpolateBlues)
+            .domain([0, d3.max(data, d => d.normalized_value)]);
+
+        chart.bars.selectAll('rect.bar')
+            .data(data, d => d.country)
+            .join(
+                enter => enter.append('rect')
+                    .attr('class', 'bar')
+                    .attr('x', d => x(d.country))
+                    .attr('width', x.bandwidth())
+                    .attr('y', height)
+                    .attr('height', 0),
+                update => update,
+                exit => shrinkToBaseline(exit, t, height)
+            )
+            .call(bindTooltip, d => `<b>${d.country}</b><br>Normalized: ${d.normalized_value.toFixed(2)}<br>Raw: ${d.raw_value.toFixed(2)}`)
+            .transition(t)
+            .attr('x', d => x(d.country))
+            .attr('width', x.bandwidth())
+            .attr('y', d => y(d.normalized_value))
+            .attr('height', d => height - y(d.normalized_value))
+            .attr('fill', d => color(d.normalized_value));
+
+        // Axes
+        chart.xAxis.transition(t).call(d3.axisBottom(x));
+        chart.xAxis.selectAll('text')
+            .attr('transform', 'rotate(-45)')
+            .style('text-anchor', 'end');
+        chart.yAxis.transition(t).call(d3.axisLeft(y));
+
+        return data.length.toString();
+    }
+
+    // Nutrients: normalized inputs vs outputs per country
+    function nutrientsGroupedBars(containerId, data) {
+        data = window.dashboardPayloads.toRecords(data);
+        const height = 350;
+        const measures = ["Inputs", "Outputs"];
+        const color = d3.scaleOrdinal().domain(measures).range(["#3498db", "#e74c3c"]);
+
+        const chart = getChart(containerId, {top: 30, right: 30, bottom: 150, left: 80}, chart => {
+            chart.x0 = d3.scaleBand().paddingInner(0.2);
+            chart.x1 = d3.scaleBand().domain(measures).padding(0.05);
+            chart.y = d3.scaleLinear().range([height, 0]);
+            chart.groups = chart.g.append('g');
+            chart.xAxis = chart.g.append('g').attr('transform', `translate(0,${height})`);
+            chart.yAxis = chart.g.append('g');
+
+            // Legend
+            chart.legend = chart.g.append("g");
+            measures.forEach((key, i) => {
+                chart.legend.append("rect")
+                    .attr("x", 0)
+                    .attr("y", i * 20)
+                    .attr("width", 15)
+                    .attr("height", 15)
+                    .attr("fill", color(key));
+                chart.legend.append("text")
+                    .attr("x", 20)
+                    .attr("y", i * 20 + 12)
+                    .text(key)
+                    .style("fill", "#fff")
+                    .style("font-size", "12px");
+            });
+        });
+        if (!chart) {
+            return "0";
+        }
+
+        if (!data || !Array.isArray(data) || data.length === 0) {
+            showMessage(chart, 'No data available');
+            return "0";
+        }
+
+        // One group per country holding its [{country, measure, value}] bars
+        const grouped = data.map(d => ({
+            country: d.country,
+            values: [
+                { country: d.country, measure: "Inputs", value: d.inputs },
+                { country: d.country, measure: "Outputs", value: d.outputs }
+            ]
+        }));
+
+        const width = resize(chart, 0, height);
+        const t = chart.svg.transition().duration(DURATION);
+        const x0 = chart.x0.domain(grouped.map(d => d.country)).range([0, width]);
+        const x1 = chart.x1.range([0, x0.bandwidth()]);
+        const y = chart.y.domain([0, d3.max(data, d => Math.max(d.inputs, d.outputs)) * 1.1]).nice();
+
+        const groups = chart.groups.selectAll('g.country')
+            .data(grouped, d => d.country)
+            .join(
+                enter => enter.append('g')
+                    .attr('class', 'country')
+                    .attr('transform', d => `translate(${x0(d.country)},0)`),
+                update => update,
+                exit => exit.transition(t).style('opacity', 0).remove()
+            );
+        groups.transition(t)
+            .style('opacity', 1)
+            .attr('transform', d => `translate(${x0(d.country)},0)`);
+
+        groups.selectAll('rect')
+            .data(d => d.values, d => d.measure)
+            .join(
+                enter => enter.append('rect')
+                    .attr('x', d => x1(d.measure))
+                    .attr('y', height)
+                    .attr('width', x1.bandwidth())
+                    .attr('height', 0)
+                    .attr('fill', d => color(d.measure)),
+                update => update,
+                exit => shrinkToBaseline(exit, t, height)
+            )
+            .call(bindTooltip, d => `<b>${d.country}</b><br>${d.measure}: ${d.value.toFixed(2)}`)
+            .transition(t)
+            .attr('x', d => x1(d.measure))
+            .attr('width', x1.bandwidth())
+            .attr("y", d => y(d.value))
+            .attr("height", d => height - y(d.value));
+
+        // Axes
+        chart.xAxis.transition(t).call(d3.axisBottom(x0));
+        chart.xAxis.selectAll('text')
+            .attr('transform', 'rotate(-45)')
+            .style('text-anchor', 'end')
+            .style('fill', '#fff');
+        chart.yAxis.transition(t).call(d3.axisLeft(y));
+        chart.yAxis.selectAll('text').style('fill', '#fff');
+
+        chart.legend.attr("transform", `translate(${width - 120}, 0)`);
+
+        return data.length.toString();
+    }
+
+    // Water: contamination rate of the high-risk countries
+    function waterRiskBars(containerId, data, options) {
+        data = window.dashboardPayloads.toRecords(data);
+        const textColor = (options && options.textColor) || '#fff';
+        const height = 350;
+
+        // Color function
+        const getColor = (rate) => {
+            if (rate >= 50) return '#f94449';      // Severe - Red
+            if (rate >= 30) return '#fdac68';      // High - Orange
+            if (rate >= 15) return '#fae588';      // Moderate - Yellow
+            return '#b9ffaf';                      // Low - Green
+        };
+
+        const chart = getChart(containerId, {top: 50, right: 70, bottom: 120, left: 90}, chart => {
+            chart.x = d3.scaleBand().padding(0.15);
+            chart.y = d3.scaleLinear().range([height, 0]);
+            chart.grid = chart.g.append('g')
+                .attr('class', 'grid')
+                .style('stroke-dasharray', '2,2')
+                .style('opacity', 0.1);
+            chart.bars = chart.g.append('g');
+            chart.labels = chart.g.append('g');
+            chart.xAxis = chart.g.append('g').attr('transform', `translate(0,${height})`);
+            chart.yAxis = chart.g.append('g');
+
+            // Axis label
+            chart.g.append('text')
+                .attr('transform', 'rotate(-90)')
+                .attr('y', 0 - chart.margin.left + 20)
+                .attr('x', 0 - (height / 2))
+                .attr('dy', '1em')
+                .style('text-anchor', 'middle')
+                .style('fill', textColor)
+                .style('font-size', '12px')
+                .style('font-family', 'Inter, sans-serif')
+                .text('Contamination Rate (%)');
+
+            // Summary stats
+            chart.summary = chart.g.append('text')
+                .attr('y', -15)
+                .attr('text-anchor', 'end')
+                .style('fill', textColor)
+                .style('font-size', '11px')
+                .style('font-family', 'Inter, sans-serif')
+                .style('font-weight', 'bold');
+        });
+        if (!chart) {
+            return data ? data.length.toString() : '0';
+        }
+
+        if (!data || data.length === 0) {
+            showMessage(chart, 'No contamination data available for current filters', textColor);
+            return '0';
+        }
+
+        // Sort and limit data
+        const sortedData = data.slice().sort((a, b) => b.contamination_rate - a.contamination_rate).slice(0, 20);
+
+        const width = resize(chart, 600, height);
+        const t = chart.svg.transition().duration(DURATION);
+        const xScale = chart.x.domain(sortedData.map(d => d.country)).range([0, width]);
+        const yScale = chart.y.domain([0, d3.max(sortedData, d => d.contamination_rate) * 1.1]);
+
+        const riskLevel = rate => rate >= 50 ? 'Severe' : rate >= 30 ? 'High' : rate >= 15 ? 'Moderate' : 'Low';
+
+        chart.bars.selectAll('rect.bar')
+            .data(sortedData, d => d.country)
+            .join(
+                enter => enter.append('rect')
+                    .attr('class', 'bar')
+                    .attr('x', d => xScale(d.country))
+                    .attr('width', xScale.bandwidth())
+                    .attr('y', height)
+                    .attr('height', 0)
+                    .attr('stroke', 'rgba(255,255,255,0.2)')
+                    .attr('stroke-width', 1)
+                    .style('cursor', 'pointer')
+                    .on('mouseover.highlight', function() {
+                        d3.select(this)
+                            .transition().duration(150)
+                            .attr('opacity', 0.8)
+                            .attr('stroke-width', 2)
+                            .attr('stroke', 'white');
+                    })
+                    .on('mouseout.highlight', function() {
+                        d3.select(this)
+                            .transition().duration(150)
+                            .attr('opacity', 1)
+                            .attr('stroke-width', 1)
+                            .attr('stroke', 'rgba(255,255,255,0.2)');
+                    }),
+                update => update,
+                exit => shrinkToBaseline(exit, t, height)
+            )
+            .call(bindTooltip, d => `
+                <div style="font-weight: bold; margin-bottom: 5px;">${d.country}</div>
+                <div style="color: ${getColor(d.contamination_rate)}; margin-bottom: 3px;">● ${riskLevel(d.contamination_rate)} Risk</div>
+                <div><strong>${d.contamination_rate.toFixed(1)}%</strong> contamination rate</div>
+                <div>${d.monitoring_sites} monitoring sites</div>
+                <div>Main pollutant: ${d.main_pollutant}</div>
+            `)
+            .transition(t)
+            .attr('x', d => xScale(d.country))
+            .attr('width', xScale.bandwidth())
+            .attr('y', d => yScale(d.contamination_rate))
+            .attr('height', d => height - yScale(d.contamination_rate))
+            .attr('fill', d => getColor(d.contamination_rate));
+
+        // Value labels
+        chart.labels.selectAll('text.label')
+            .data(sortedData, d => d.country)
+            .join(
+                enter => enter.append('text')
+                    .attr('class', 'label')
+                    .attr('text-anchor', 'middle')
+                    .attr('x', d => xScale(d.country) + xScale.bandwidth() / 2)
+                    .attr('y', height - 8)
+                    .style('fill', textColor)
+                    .style('font-size', '11px')
+                    .style('font-weight', 'bold')
+                    .style('font-family', 'Inter, sans-serif')
+                    .style('opacity', 0),
+                update => update,
+                exit => exit.transition(t).style('opacity', 0).remove()
+            )
+            .text(d => d.contamination_rate.toFixed(1) + '%')
+            .transition(t)
+            .attr('x', d => xScale(d.country) + xScale.bandwidth() / 2)
+            .attr('y', d => yScale(d.contamination_rate) - 8)
+            .style('opacity', 1);
+
+        // Axes
+        chart.xAxis.transition(t).call(d3.axisBottom(xScale));
+        chart.xAxis.selectAll('text')
+            .style('text-anchor', 'end')
+            .style('fill', textColor)
+            .style('font-family', 'Inter, sans-serif')
+            .style('font-size', '10px')
+            .attr('dx', '-.8em')
+            .attr('dy', '.15em')
+            .attr('transform', 'rotate(-45)');
+
+        chart.yAxis.transition(t).call(d3.axisLeft(yScale).tickFormat(d => d + '%'));
+        chart.yAxis.selectAll('text')
+            .style('fill', textColor)
+            .style('font-family', 'Inter, sans-serif')
+            .style('font-size', '11px');
+
+        chart.xAxis.selectAll('.domain, .tick line')
+            .style('stroke', textColor)
+            .style('opacity', 0.3);
+        chart.yAxis.selectAll('.domain, .tick line')
+            .style('stroke', textColor)
+            .style('opacity', 0.3);
+
+        // Gridlines
+        chart.grid.transition(t).call(d3.axisLeft(yScale).tickSize(-width).tickFormat(''));
+        chart.grid.selectAll('line').style('stroke', textColor);
+        chart.grid.selectAll('path').style('stroke-width', 0);
+
+        const avgRate = d3.mean(sortedData, d => d.contamination_rate);
+        const severeCount = sortedData.filter(d => d.contamination_rate >= 50).length;
+        const highCount = sortedData.filter(d => d.contamination_rate >= 30 && d.contamination_rate < 50).length;
+        chart.summary
+            .attr('x', width)
+            .text(`Avg: ${avgRate.toFixed(1)}% | Severe: ${severeCount} | High: ${highCount}`);
+
+        return data.length.toString();
+    }
+
+    return {
+        overviewBars: overviewBars,
+        nutrientsGroupedBars: nutrientsGroupedBars,
+        waterRiskBars: waterRiskBars
+    };
+})();
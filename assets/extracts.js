@@ -0,0 +1,210 @@
+// Clientside filtering over the per-page extracts built by
+// components/helpers/extracts.py (enabled with AEID_CLIENTSIDE).
+// Columns arrive as base64 typed arrays, strings as dictionary codes plus a
+// values list; each store payload is decoded once and then filtered in the
+// browser with the same rules as apply_filters() on the server.
+window.dashboardExtracts = (function() {
+
+    const ARRAY_TYPES = {
+        int8: Int8Array,
+        uint8: Uint8Array,
+        int16: Int16Array,
+        uint16: Uint16Array,
+        int32: Int32Array,
+        uint32: Uint32Array,
+        float32: Float32Array,
+        float64: Float64Array
+    };
+    const tables = new WeakMap();
+
+    function decodeColumn(column) {
+        const binary = atob(column.bdata);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        const array = new ARRAY_TYPES[column.dtype](bytes.buffer);
+        return column.values ? {codes: array, values: column.values} : array;
+    }
+
+    function load(extract) {
+        if (!extract || !extract.columns) {
+            return null;
+        }
+        let table = tables.get(extract);
+        if (!table) {
+            table = {length: extract.length, columns: {}};
+            for (const name of Object.keys(extract.columns)) {
+                table.columns[name] = decodeColumn(extract.columns[name]);
+            }
+            tables.set(extract, table);
+        }
+        return table;
+    }
+
+    // 'All' (or an empty selection) means no filter on that column
+    function isActive(selection) {
+        return Array.isArray(selection) && selection.length > 0 && selection.indexOf('All') === -1;
+    }
+
+    // Indices of the rows matching `filters` ({column: selection}) and `yearRange`
+    function select(table, filters, yearRange) {
+        const tests = [];
+        for (const name of Object.keys(filters)) {
+            if (!isActive(filters[name])) {
+                continue;
+            }
+            const column = table.columns[name];
+            const allowed = new Uint8Array(column.values.length);
+            column.values.forEach((value, code) => {
+                allowed[code] = filters[name].indexOf(value) !== -1 ? 1 : 0;
+            });
+            tests.push([column.codes, allowed]);
+        }
+        const year = table.columns.year;
+        const ranged = Array.isArray(yearRange) && yearRange.length === 2;
+
+        const rows = [];
+        rowLoop:
+        for (let i = 0; i < table.length; i++) {
+            if (ranged && (year[i] < yearRange[0] || year[i] > yearRange[1])) {
+                continue;
+            }
+            for (const [codes, allowed] of tests) {
+                if (codes[i] < 0 || !allowed[codes[i]]) {
+                    continue rowLoop;
+                }
+            }
+            rows.push(i);
+        }
+        return rows;
+    }
+
+    function valueAt(column, i) {
+        return column.codes[i] < 0 ? null : column.values[column.codes[i]];
+    }
+
+    // Mean of `values` over `rows`, skipping NaN like pandas
+    function mean(values, rows) {
+        let sum = 0;
+        let count = 0;
+        for (const i of rows) {
+            if (!Number.isNaN(values[i])) {
+                sum += values[i];
+                count += 1;
+            }
+        }
+        return count ? sum / count : NaN;
+    }
+
+    // Python's f"{value:,.2f}"
+    function formatNumber(value) {
+        if (Number.isNaN(value)) {
+            return 'nan';
+        }
+        if (!Number.isFinite(value)) {
+            return value > 0 ? 'inf' : '-inf';
+        }
+        return value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    // Row indices grouped by country, then by the value of `keyColumn` (or null)
+    function groupByCountry(table, rows, keyColumn) {
+        const country = table.columns.country;
+        const groups = new Map();
+        for (const i of rows) {
+            const name = valueAt(country, i);
+            const key = keyColumn ? valueAt(table.columns[keyColumn], i) : null;
+            if (!groups.has(name)) {
+                groups.set(name, new Map());
+            }
+            const byKey = groups.get(name);
+            if (!byKey.has(key)) {
+                byKey.set(key, []);
+            }
+            byKey.get(key).push(i);
+        }
+        return groups;
+    }
+
+    // Overview D3 data: average raw and normalized balance per country
+    function overviewBalance(extract, categories, years, countries) {
+        const table = load(extract);
+        if (!table) {
+            return [];
+        }
+        const rows = select(table, {measure_category: categories, country: countries}, years);
+        const records = [];
+        groupByCountry(table, rows).forEach((byKey, country) => {
+            const countryRows = byKey.get(null);
+            records.push({
+                country: country,
+                raw_value: mean(table.columns.obs_value, countryRows),
+                normalized_value: mean(table.columns.obs_value_log_normalized, countryRows)
+            });
+        });
+        return records.sort((a, b) => b.normalized_value - a.normalized_value);
+    }
+
+    // Nutrients KPIs: average normalized Nitrogen / Phosphorus balance
+    function nutrientsKpis(extract, countries, years, nutrients, categories, status) {
+        const table = load(extract);
+        if (!table) {
+            return ['0', '0'];
+        }
+        const rows = select(table, {
+            country: countries,
+            nutrients: nutrients,
+            measure_category: categories,
+            observation_status: status
+        }, years);
+
+        const category = table.columns.measure_category;
+        const nutrient = table.columns.nutrients;
+        return ['Nitrogen', 'Phosphorus'].map(name => {
+            const balance = rows.filter(i =>
+                valueAt(category, i) === 'Balance (inputs minus outputs)' && valueAt(nutrient, i) === name);
+            return balance.length ? formatNumber(mean(table.columns.obs_value_log_normalized, balance)) : '0';
+        });
+    }
+
+    // Nutrients D3 data: normalized inputs and outputs per country
+    function nutrientsFlows(extract, categories, years, nutrients, countries, status) {
+        const table = load(extract);
+        if (!table) {
+            return [];
+        }
+        const category = table.columns.measure_category;
+        const rows = select(table, {
+            measure_category: categories,
+            nutrients: nutrients,
+            country: countries,
+            observation_status: status
+        }, years).filter(i => {
+            const name = valueAt(category, i);
+            return name === 'Nutrient inputs' || name === 'Nutrient outputs';
+        });
+
+        const values = table.columns.obs_value_log_normalized;
+        const records = [];
+        groupByCountry(table, rows, 'measure_category').forEach((byKey, country) => {
+            const inputs = byKey.has('Nutrient inputs') ? mean(values, byKey.get('Nutrient inputs')) : NaN;
+            const outputs = byKey.has('Nutrient outputs') ? mean(values, byKey.get('Nutrient outputs')) : NaN;
+            records.push({
+                country: country,
+                inputs: Number.isNaN(inputs) ? 0 : inputs,
+                outputs: Number.isNaN(outputs) ? 0 : outputs
+            });
+        });
+        return records.sort((a, b) => (a.country < b.country ? -1 : a.country > b.country ? 1 : 0));
+    }
+
+    return {
+        load: load,
+        select: select,
+        formatNumber: formatNumber,
+        overviewBalance: overviewBalance,
+        nutrientsKpis: nutrientsKpis,
+        nutrientsFlows: nutrientsFlows
+    };
+})();
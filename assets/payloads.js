@@ -0,0 +1,20 @@
+// Column-oriented store payloads ({column: [values]}, see
+// components/helpers/serialization.py) back into the row objects D3 binds to.
+window.dashboardPayloads = {
+    toRecords: function(data) {
+        if (!data || Array.isArray(data)) {
+            return data;
+        }
+        const columns = Object.keys(data);
+        const length = columns.length ? data[columns[0]].length : 0;
+        const records = new Array(length);
+        for (let i = 0; i < length; i++) {
+            const row = {};
+            for (const column of columns) {
+                row[column] = data[column][i];
+            }
+            records[i] = row;
+        }
+        return records;
+    }
+};
@@ -0,0 +1,198 @@
+"""
+Benchmark every server callback registered by the app.
+
+    python benchmarks/callback_bench.py                              # report only
+    python benchmarks/callback_bench.py --synthetic --baseline benchmarks/baseline.json
+    python benchmarks/callback_bench.py --synthetic --scale 4        # offline, ~400k rows
+
+Imports `app`, takes each entry of `app.callback_map` that runs on the server
+and calls it directly (no HTTP, no Dash request context) over a matrix of
+filter states: the page defaults, a single country, many countries, a
+narrow year range and a selection that matches no rows. For every callback
+it reports p50/p95 latency, peak memory allocated during one call
+(tracemalloc) and the size of the JSON response Dash would send.
+
+The figure cache is cleared before every call, so figure callbacks are timed
+building their figure; pass --warm to time cache hits instead.
+When data/Dataset-Cleaned.csv is missing (or with --synthetic) the app runs
+on a dataset from benchmarks/synthetic_data.py written to a temporary dir.
+With --baseline, callbacks whose p50 grew by more than --threshold (and by
+at least --min-ms, so sub-millisecond noise is ignored) are listed and the
+exit status is 1.
+
+benchmarks/baseline.json holds the defaults (--repeat 5, cold figure cache)
+on the synthetic dataset, so compare against it with --synthetic. Timings
+depend on the machine: record a baseline where the check will run, from the
+commit to compare against, with
+
+    python benchmarks/callback_bench.py --synthetic --save benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from plotly.io.json import to_json_plotly  # noqa: E402
+
+from components.helpers.data_loader import DATA_PATH  # noqa: E402
+from components.helpers.dataset import get_dataset_handle  # noqa: E402
+from components.helpers.figure_cache import clear_figure_cache  # noqa: E402
+from components.helpers.warmup import layout_defaults, server_callbacks  # noqa: E402
+from synthetic_data import write_dataset  # noqa: E402
+
+# A selection no row carries, for the 'empty' state
+NO_MATCH = '(no such value)'
+
+
+def filter_states(df):
+    """Name -> {component id: value}; the layout defaults fill every input a state doesn't set."""
+    counts = df['country'].value_counts()
+    countries = [str(c) for c in counts.index]
+    last_year = int(df['year'].max())
+    return {
+        'defaults': {},
+        'single-country': {'country-dropdown': countries[:1]},
+        'many-countries': {'country-dropdown': countries[:15]},
+        'narrow-years': {'year-slider': [last_year - 1, last_year]},
+        'empty': {'country-dropdown': [NO_MATCH]},
+    }
+
+
+def call(func, args, warm):
+    if not warm:
+        clear_figure_cache()
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def peak_allocation(func, args, warm):
+    if not warm:
+        clear_figure_cache()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run(app, df, repeat, warm):
+    defaults = layout_defaults(app)
+    states = filter_states(df)
+    results = {}
+    for key, name, func, deps in server_callbacks(app):
+        times, sizes, peaks, errors = [], [], [], []
+        for state_name, state in states.items():
+            args = [state.get(dep['id'], defaults.get(dep['id'])) for dep in deps]
+            try:
+                call(func, args, warm)  # first call builds shared views/aggregates
+                for _ in range(repeat):
+                    elapsed, result = call(func, args, warm)
+                    times.append(elapsed)
+                sizes.append(len(to_json_plotly(result)))
+                peaks.append(peak_allocation(func, args, warm))
+            except Exception as e:
+                errors.append(f"{state_name}: {type(e).__name__}: {e}")
+        results[key] = {
+            'name': name,
+            'p50_ms': statistics.median(times) * 1000 if times else None,
+            'p95_ms': percentile(times, 95) * 1000 if times else None,
+            'peak_alloc_kb': max(peaks) / 1024 if peaks else None,
+            'payload_kb': max(sizes) / 1024 if sizes else None,
+            'errors': errors,
+        }
+    return results
+
+
+def report(results, baseline=None, threshold=1.25, min_ms=1.0):
+    header = f"{'callback':<52}{'p50 ms':>9}{'p95 ms':>9}{'alloc KB':>10}{'JSON KB':>9}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+
+    regressions = []
+    for key, row in sorted(results.items(), key=lambda item: item[1]['name']):
+        if row['p50_ms'] is None:
+            print(f"{row['name']:<52}  failed: {'; '.join(row['errors'])}")
+            continue
+        line = (f"{row['name']:<52}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+                f"{row['peak_alloc_kb']:>10.0f}{row['payload_kb']:>9.1f}")
+        base = (baseline or {}).get(key)
+        if base and base.get('p50_ms'):
+            ratio = row['p50_ms'] / base['p50_ms']
+            slower = ratio > threshold and row['p50_ms'] - base['p50_ms'] >= min_ms
+            flag = '  REGRESSED' if slower else ''
+            line += f"{ratio:>12.2f}x{flag}"
+            if flag:
+                regressions.append(row['name'])
+        print(line)
+        for error in row['errors']:
+            print(f"    ! {error}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='timed calls per callback and filter state')
+    parser.add_argument('--warm', action='store_true', help='keep the figure cache between calls')
+    parser.add_argument('--synthetic', action='store_true', help='use synthetic data even if the CSV exists')
+    parser.add_argument('--scale', type=float, default=1.0, help='synthetic dataset size (1.0 is ~100k rows)')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a baseline JSON file')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=1.25, help='p50 ratio counted as a regression')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='smallest p50 increase counted as a regression')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    dataset = get_dataset_handle()
+    if args.synthetic or not os.path.exists(DATA_PATH):
+        dataset.path = os.path.join(tempfile.mkdtemp(prefix='aeid-bench-'), 'Dataset-Cleaned.csv')
+        rows = write_dataset(dataset.path, scale=args.scale)
+        print(f"Using synthetic dataset: {rows:,} rows ({dataset.path})")
+
+    start = time.perf_counter()
+    import app as app_module
+    print(f"App import and dataset load: {time.perf_counter() - start:.2f}s, "
+          f"{len(dataset.frame):,} rows\n")
+
+    results = run(app_module.app, dataset.frame, args.repeat, args.warm)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            saved = json.load(fh)
+        if (saved.get('rows'), saved.get('warm')) != (len(dataset.frame), args.warm):
+            print(f"Warning: {args.baseline} was recorded on {saved.get('rows'):,} rows "
+                  f"{'with' if saved.get('warm') else 'without'} --warm; the comparison is not like for like\n")
+        baseline = saved['callbacks']
+    regressions = report(results, baseline, args.threshold, args.min_ms)
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump({'rows': len(dataset.frame), 'repeat': args.repeat, 'warm': args.warm,
+                       'callbacks': results}, fh, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if regressions:
+        print(f"\n{len(regressions)} callback(s) slower than {args.threshold}x baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
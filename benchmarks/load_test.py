@@ -0,0 +1,164 @@
+"""
+Local load test for a running dashboard.
+
+    python app.py                                   # or gunicorn app:server
+    python benchmarks/load_test.py --url http://127.0.0.1:8050 --encoding br
+    python benchmarks/load_test.py --encoding identity   # baseline, no compression
+
+Replays a mix of page, asset and callback requests with a thread pool and
+reports latency and the bytes actually sent over the wire for each.
+Only the standard library is used, and responses are not decompressed, so
+the byte counts reflect Content-Encoding.
+
+Afterwards every CSS and JS file in assets/ is requested once with
+`Accept-Encoding: gzip` only (what older clients and many proxies send);
+the exit status is 1 if any of them comes back uncompressed.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ASSETS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+# Files smaller than the app's AEID_COMPRESS_MIN_BYTES default are sent as is
+MIN_COMPRESSED_BYTES = 1024
+
+FILTERS = [
+    {'id': 'category-dropdown', 'property': 'value', 'value': ['All']},
+    {'id': 'year-slider', 'property': 'value', 'value': [1990, 2020]},
+    {'id': 'country-dropdown', 'property': 'value', 'value': ['All']},
+]
+
+
+def callback_body(output_id, prop, inputs, changed=()):
+    return {
+        'output': f'{output_id}.{prop}',
+        'outputs': {'id': output_id, 'property': prop},
+        'inputs': inputs,
+        'changedPropIds': list(changed),
+        'state': [],
+    }
+
+
+SCENARIOS = {
+    'index': ('GET', '/', None),
+    'layout': ('GET', '/_dash-layout', None),
+    'dependencies': ('GET', '/_dash-dependencies', None),
+    'asset-bg': ('GET', '/assets/bg.gif?m=1', None),
+    'favicon': ('GET', '/assets/favicon.ico?m=1', None),
+    'trend-chart': ('POST', '/_dash-update-component', callback_body('trend-chart', 'figure', FILTERS)),
+    'heatmap': ('POST', '/_dash-update-component', callback_body('area-chart', 'figure', FILTERS)),
+}
+
+
+def fetch(base_url, name, encoding):
+    method, path, body = SCENARIOS[name]
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method)
+    req.add_header('Accept-Encoding', encoding)
+    if data is not None:
+        req.add_header('Content-Type', 'application/json')
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            payload = resp.read()
+            status = resp.status
+            headers = resp.headers
+    except Exception as e:
+        return name, None, 0, str(e), {}
+    elapsed = time.perf_counter() - start
+    return name, elapsed, len(payload), status, {
+        'content-encoding': headers.get('Content-Encoding', 'identity'),
+        'cache-control': headers.get('Cache-Control', ''),
+    }
+
+
+def compressible_assets():
+    """Paths under /assets/ of the CSS and JS files large enough to be compressed."""
+    for root, _, files in os.walk(ASSETS_FOLDER):
+        for filename in sorted(files):
+            filepath = os.path.join(root, filename)
+            if filename.endswith(('.css', '.js')) and os.path.getsize(filepath) >= MIN_COMPRESSED_BYTES:
+                yield '/assets/' + os.path.relpath(filepath, ASSETS_FOLDER).replace(os.sep, '/')
+
+
+def check_gzip_assets(base_url):
+    """Request each compressible asset accepting gzip only; returns the paths sent uncompressed."""
+    print(f"\n{'asset (Accept-Encoding: gzip)':<40}{'bytes':>11}  encoding")
+    uncompressed = []
+    for path in compressible_assets():
+        req = urllib.request.Request(base_url.rstrip('/') + path)
+        req.add_header('Accept-Encoding', 'gzip')
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                size = len(resp.read())
+                encoding = resp.headers.get('Content-Encoding', 'identity')
+        except Exception as e:
+            size, encoding = 0, f"error: {e}"
+        print(f"{path:<40}{size:>11}  {encoding}")
+        if encoding != 'gzip':
+            uncompressed.append(path)
+    return uncompressed
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8050')
+    parser.add_argument('--requests', type=int, default=20, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--encoding', default='br, gzip', help="Accept-Encoding to send ('identity' disables compression)")
+    parser.add_argument('--scenarios', nargs='*', default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    jobs = [name for name in args.scenarios for _ in range(args.requests)]
+    results = defaultdict(list)
+    info = {}
+    errors = defaultdict(int)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for name, elapsed, size, status, headers in pool.map(lambda n: fetch(args.url, n, args.encoding), jobs):
+            if elapsed is None or status != 200:
+                errors[name] += 1
+                continue
+            results[name].append((elapsed, size))
+            info[name] = headers
+    wall = time.perf_counter() - start
+
+    print(f"{'scenario':<14}{'ok':>5}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'bytes':>11}  encoding / cache-control")
+    total_bytes = 0
+    for name in args.scenarios:
+        samples = results.get(name, [])
+        if not samples:
+            print(f"{name:<14}{0:>5}{errors[name]:>5}")
+            continue
+        times = [t * 1000 for t, _ in samples]
+        sizes = [s for _, s in samples]
+        total_bytes += sum(sizes)
+        print(f"{name:<14}{len(samples):>5}{errors[name]:>5}{statistics.median(times):>9.1f}"
+              f"{percentile(times, 95):>9.1f}{int(statistics.mean(sizes)):>11}  "
+              f"{info[name]['content-encoding']} / {info[name]['cache-control'] or '-'}")
+
+    print(f"\n{len(jobs)} requests in {wall:.2f}s ({len(jobs) / wall:.1f} req/s), "
+          f"{total_bytes / 1e6:.2f} MB transferred")
+
+    uncompressed = check_gzip_assets(args.url)
+    if uncompressed:
+        print(f"\n{len(uncompressed)} asset(s) not gzip-compressed: {', '.join(uncompressed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Synthetic stand-in for data/Dataset-Cleaned.csv.
+
+    python benchmarks/synthetic_data.py /tmp/Dataset-Cleaned.csv --scale 4
+
+Same columns, category values and value ranges as the cleaned OECD extract,
+with every measure the pages filter on, so the app and the benchmarks can
+run offline. `scale` multiplies the row count (about 100k rows at 1.0).
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    'country_code', 'country', 'year', 'obs_value', 'measure_code', 'measure_category',
+    'erosion_risk_level', 'water_type', 'nutrients', 'measure_unit',
+    'observation_status', 'obs_status', 'unit_multiplier',
+]
+
+COUNTRIES = [
+    'Australia', 'Austria', 'Belgium', 'Canada', 'Chile', 'China', 'Colombia', 'Costa Rica', 'Czechia',
+    'Denmark', 'Estonia', 'Finland', 'France', 'Germany', 'Greece', 'Hungary', 'Iceland', 'India',
+    'Indonesia', 'Ireland', 'Israel', 'Italy', 'Japan', 'Kazakhstan', 'Korea', 'Latvia', 'Lithuania',
+    'Luxembourg', 'Malta', 'Mexico', 'Netherlands', 'New Zealand', 'Norway', 'Poland', 'Portugal',
+    'Slovak Republic', 'Slovenia', 'Spain', 'Sweden', 'Switzerland', 'Turkey', 'United Kingdom',
+    'United States', 'Brazil', 'Argentina', 'South Africa', 'North Korea', 'Russia',
+    'World', 'OECD', 'EU', 'OECD Europe', 'OECD America',
+]
+YEARS = np.arange(1985, 2024)
+
+STATUSES = ['Normal value', 'Estimated value', 'Provisional value']
+STATUS_WEIGHTS = [0.6, 0.2, 0.2]
+
+NUTRIENTS = ['Nitrogen', 'Phosphorus']
+EROSION_LEVELS = ['Low', 'Moderate', 'Tolerable', 'High', 'Severe', 'Total']
+WATER_TYPES = ['Surface water', 'Ground water']
+NA = 'Not applicable'
+
+WATER_LIMIT = 'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for '
+
+# (measure_category, measure_unit, nutrients, water types, erosion levels, share of country-years present, value range)
+MEASURES = (
+    [('Balance (inputs minus outputs)', 'Tonnes', NUTRIENTS, [NA], [NA], 0.9, (-50, 500)),
+     ('Balance (inputs minus outputs)', 'Kilograms per hectare', NUTRIENTS, [NA], [NA], 0.9, (-10, 80)),
+     ('Nutrient inputs', 'Tonnes', NUTRIENTS, [NA], [NA], 0.9, (0, 900)),
+     ('Nutrient outputs', 'Tonnes', NUTRIENTS, [NA], [NA], 0.9, (0, 600))]
+    + [(measure, 'Tonnes', NUTRIENTS, [NA], [NA], 0.6, (0, 1000)) for measure in [
+        'Manure management', 'Manure imports', 'Manure withdrawals', 'Net input of manure',
+        'Livestock manure production', 'Organic fertilisers (excluding livestock manure)']]
+    + [('Total agricultural land area', 'Thousand hectares', [NA], [NA], [NA], 0.8, (10, 50000)),
+       ('Water erosion', 'Percentage', [NA], [NA], EROSION_LEVELS, 0.25, (0, 60)),
+       ('Wind erosion', 'Percentage', [NA], [NA], EROSION_LEVELS, 0.25, (0, 60))]
+    + [(WATER_LIMIT + pollutant, 'Percentage', [NA], WATER_TYPES, [NA], 0.3, (0, 70))
+       for pollutant in ['nitrate', 'phosphorus', 'pesticides']]
+    + [('Share of monitoring sites in agricultural areas where one or more pesticides are present',
+        'Percentage', [NA], WATER_TYPES, [NA], 0.3, (0, 90)),
+       ('Agriculture freshwater abstraction', 'Cubic metres', [NA], WATER_TYPES + ['Total'], [NA], 0.5, (1e3, 1e7)),
+       ('Total freshwater abstraction', 'Cubic metres', [NA], WATER_TYPES + ['Total'], [NA], 0.5, (1e4, 1e8))]
+    + [(f'Other indicator {i}', 'Index', [NA], [NA], [NA], 0.7, (0, 10)) for i in range(40)]
+)
+
+
+def generate_dataset(scale=1.0, seed=0):
+    """Return a synthetic cleaned dataset as a DataFrame of plain strings and numbers."""
+    rng = np.random.default_rng(seed)
+    countries = np.repeat(np.array(COUNTRIES, dtype=object), len(YEARS))
+    years = np.tile(YEARS, len(COUNTRIES))
+    # Above 1.0 each country-year carries several observations of a measure
+    repeats = max(1, int(np.ceil(scale)))
+
+    parts = []
+    for category, unit, nutrients, water_types, erosion_levels, share, (low, high) in MEASURES:
+        for nutrient in nutrients:
+            for water_type in water_types:
+                for erosion_level in erosion_levels:
+                    for _ in range(repeats):
+                        keep = rng.random(len(years)) < share * scale / repeats
+                        n = int(keep.sum())
+                        parts.append(pd.DataFrame({
+                            'country_code': [c[:3].upper() for c in countries[keep]],
+                            'country': countries[keep],
+                            'year': years[keep],
+                            'obs_value': rng.uniform(low, high, n),
+                            'measure_code': category[:6].upper(),
+                            'measure_category': category,
+                            'erosion_risk_level': erosion_level,
+                            'water_type': water_type,
+                            'nutrients': nutrient,
+                            'measure_unit': unit,
+                            'observation_status': rng.choice(STATUSES, n, p=STATUS_WEIGHTS),
+                            'obs_status': 'A',
+                            'unit_multiplier': 'Units',
+                        }))
+    return pd.concat(parts, ignore_index=True)[COLUMNS]
+
+
+def write_dataset(path, scale=1.0, seed=0):
+    df = generate_dataset(scale, seed)
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='CSV file to write')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(f"{write_dataset(args.path, args.scale, args.seed):,} rows written to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,48 @@
-from dash import Input, Output
+import json
+
+from dash import Input, Output, State, no_update
 from dash import html, dcc
+from plotly.io.json import to_json_plotly
 
-from ..helpers.data_loader import load_data
-from ..pages.overview import overview as page1_layout
-from ..pages.nutrients import nutrients as page2_layout
-from ..pages.manure import manure as page3_layout
-from ..pages.erosion import erosion as page4_layout
-from ..pages.water import water as page5_layout
+from .. import config
+from ..helpers.cache import memoize_on_frame
+from ..helpers.dataset import get_dataset_handle
+from ..helpers.extracts import get_page_extract
+from ..pages.overview import get_overview_layout as page1_layout
+from ..pages.nutrients import get_nutrients_layout as page2_layout
+from ..pages.manure import get_manure_layout as page3_layout
+from ..pages.erosion import get_erosion_layout as page4_layout
+from ..pages.water import get_water_layout as page5_layout
 from .overview_callbacks import get_overview_callbacks
 from .manure_callbacks import get_manure_callbacks
 from .nutrients_callbacks import get_nutrients_callbacks
 from .erosion_callbacks import get_erosion_callbacks
 from .water_callbacks import get_water_callbacks
 
-df = load_data()
+dataset = get_dataset_handle()
+
+# page -> URL path of the pages with clientside callbacks
+EXTRACT_PATHS = {'overview': '/', 'nutrients': '/n'}
+
+
+def register_extract_callback(app, page):
+    @app.callback(
+        Output(f'{page}-extract', 'data'),
+        Input('url', 'pathname'),
+        State(f'{page}-extract', 'data')
+    )
+    def update_extract(pathname, current):
+        # Sent on the first visit to the page and again only after the
+        # dataset file changed; the version is the file's mtime and size,
+        # which every worker agrees on
+        if pathname != EXTRACT_PATHS[page]:
+            return no_update
+        df = dataset.frame
+        version = dataset.stats.get('source')
+        if current and current.get('version') == version:
+            return no_update
+        return dict(get_page_extract(df, page), version=version)
+
 
 def register_callbacks(app):
     @app.callback(
@@ -30,27 +59,39 @@ def register_callbacks(app):
             "/w": page5_layout,
         }
         # return 404-ish div if not found
-        return page_map.get(pathname, html.Div([
-            html.H1("404: Not found"),
-            html.P(f"No page for `{pathname}`")
-        ]))
+        if pathname not in page_map:
+            return html.Div([
+                html.H1("404: Not found"),
+                html.P(f"No page for `{pathname}`")
+            ])
+
+        # Layouts are built once per dataset version (filter options follow
+        # reloads) and kept as the decoded JSON of the component tree: plain
+        # dicts and lists that Dash encodes much faster than components.
+        # Shared between requests, so never modified
+        df = dataset.frame
+        return memoize_on_frame(df, f'layout:{pathname}', lambda: json.loads(to_json_plotly(page_map[pathname](df))))
+
+    if config.CLIENTSIDE:
+        for page in EXTRACT_PATHS:
+            register_extract_callback(app, page)
 
     #================================================================================
 
-    get_overview_callbacks(df, app)
+    get_overview_callbacks(dataset, app)
 
     #================================================================================
 
-    get_manure_callbacks(df, app)
+    get_manure_callbacks(dataset, app)
 
     #================================================================================
 
-    get_nutrients_callbacks(df, app)
+    get_nutrients_callbacks(dataset, app)
     
     #================================================================================
 
-    get_erosion_callbacks(df, app)
+    get_erosion_callbacks(dataset, app)
     
     #================================================================================
     
-    get_water_callbacks(df, app)
\ No newline at end of file
+    get_water_callbacks(dataset, app)
\ No newline at end of file
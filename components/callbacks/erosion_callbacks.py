@@ -2,149 +2,94 @@ from dash import Input, Output
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from ..helpers.get_continent import get_continent
-from ..helpers.tools import apply_filters, style_title, normalize_by_agricultural_land
+from ..helpers.background import background_options
+from ..helpers.cube import get_cube
+from ..helpers.figure_cache import cached_figure
+from ..helpers.get_continent import add_continent_column
+from ..helpers.subsets import get_subset, measures_where
+from ..helpers.tools import apply_filters, style_title, normalize_by_agricultural_land, count_values
 from ..styles import VIZ_COLOR, TEXT_COLOR, FONT_FAMILY
 
-def get_erosion_callbacks(df, app):
+def filter_erosion_data(df, countries, years, erosion_levels, erosion_types):
+    erosion_measures = get_subset(df, 'erosion')
+    d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
+                     selected_erosion_levels=erosion_levels)
+    
+    # Apply erosion type filter
+    if erosion_types and 'All' not in erosion_types:
+        d = d[d['measure_category'].isin(erosion_types)]
+    
+    return d
 
-    # KPI 1: Total Observations
-    @app.callback(
-        Output('kpi-total-observations', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_total_observations(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        total = len(d)
-        return f"{total:,}"
+def erosion_measure_categories(df, erosion_types):
+    # Same measures filter_erosion_data() keeps, for querying the aggregate cube
+    measures = measures_where(df, 'is_erosion')
+    if erosion_types and 'All' not in erosion_types:
+        measures = [m for m in measures if m in erosion_types]
+    return measures
 
-    # KPI 2: Agricultural Land at Risk
-    @app.callback(
-        Output('kpi-land-at-risk', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_land_at_risk(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        # Get total agricultural land affected by erosion
-        total_land_data = d[d['erosion_risk_level'] == 'Total']
-        if total_land_data.empty:
-            # If no 'Total' data, calculate from all risk levels
-            avg_land = d['obs_value'].mean() if not d.empty else 0
-        else:
-            avg_land = total_land_data['obs_value'].mean()
-        
-        return f"{avg_land:.1f}%"
+# KPI 1: Total Observations
+def kpi_total_observations(d):
+    total = len(d)
+    return f"{total:,}"
 
-    # KPI 3: Severe Risk Percentage
-    @app.callback(
-        Output('kpi-severe-risk-percent', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_severe_risk_percent(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        if d.empty:
-            return "0%"
-        
-        # Exclude 'Total' observations for this calculation
-        d_filtered = d[d['erosion_risk_level'] != 'Total']
-        if d_filtered.empty:
-            return "0%"
-        
-        severe_count = len(d_filtered[d_filtered['erosion_risk_level'] == 'Severe'])
-        total_count = len(d_filtered)
-        percentage = (severe_count / total_count) * 100 if total_count > 0 else 0
-        
-        return f"{percentage:.1f}%"
+# KPI 2: Agricultural Land at Risk
+def kpi_land_at_risk(d):
+    # Get total agricultural land affected by erosion
+    total_land_data = d[d['erosion_risk_level'] == 'Total']
+    if total_land_data.empty:
+        # If no 'Total' data, calculate from all risk levels
+        avg_land = d['obs_value'].mean() if not d.empty else 0
+    else:
+        avg_land = total_land_data['obs_value'].mean()
+    
+    return f"{avg_land:.1f}%"
 
-    # KPI 4: High-Risk Countries
-    @app.callback(
-        Output('kpi-high-risk-countries', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_high_risk_countries(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        # Count countries with High or Severe erosion risk
-        high_risk_indicators = ['High', 'Severe']
-        high_risk_data = d[d['erosion_risk_level'].isin(high_risk_indicators)]
-        high_risk_countries_count = high_risk_data['country'].nunique() if not high_risk_data.empty else 0
-        
-        return f"{high_risk_countries_count}"
+# KPI 3: Share of Severe Risk Observations
+def kpi_severe_risk_percent(d):
+    if d.empty:
+        return "0%"
+    
+    # Exclude 'Total' observations for this calculation
+    d_filtered = d[d['erosion_risk_level'] != 'Total']
+    if d_filtered.empty:
+        return "0%"
+    
+    severe_count = len(d_filtered[d_filtered['erosion_risk_level'] == 'Severe'])
+    total_count = len(d_filtered)
+    percentage = (severe_count / total_count) * 100 if total_count > 0 else 0
+    
+    return f"{percentage:.1f}%"
 
-    # HOVER DETAIL CALLBACKS
-    @app.callback(
-        Output('kpi-total-observations-card', 'title'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_total_observations_hover(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        if d.empty:
-            return "No observations found for selected filters"
-        
-        type_breakdown = d['measure_category'].value_counts()
-        risk_breakdown = d[d['erosion_risk_level'] != 'Total']['erosion_risk_level'].value_counts()
-        year_range = f"{d['year'].min()}-{d['year'].max()}" if d['year'].nunique() > 1 else str(d['year'].iloc[0])
-        
-        # Build strings with consistent formatting
-        newline = '\n'
-        type_lines = []
-        for erosion_type, count in type_breakdown.items():
-            type_lines.append(f"• {erosion_type}: {count} observations")
-        
-        risk_lines = []
-        for risk, count in risk_breakdown.items():
-            risk_lines.append(f"• {risk}: {count} observations")
-        
-        return f"""Total Observations: {len(d):,}
+# KPI 4: High-Risk Countries
+def kpi_high_risk_countries(d):
+    # Count countries with High or Severe erosion risk
+    high_risk_indicators = ['High', 'Severe']
+    high_risk_data = d[d['erosion_risk_level'].isin(high_risk_indicators)]
+    high_risk_countries_count = high_risk_data['country'].nunique() if not high_risk_data.empty else 0
+    
+    return f"{high_risk_countries_count}"
+
+# HOVER DETAILS FOR KPI CARDS
+def total_observations_hover(d):
+    if d.empty:
+        return "No observations found for selected filters"
+    
+    type_breakdown = count_values(d['measure_category'])
+    risk_breakdown = count_values(d[d['erosion_risk_level'] != 'Total']['erosion_risk_level'])
+    year_range = f"{d['year'].min()}-{d['year'].max()}" if d['year'].nunique() > 1 else str(d['year'].iloc[0])
+    
+    # Build strings with consistent formatting
+    newline = '\n'
+    type_lines = []
+    for erosion_type, count in type_breakdown.items():
+        type_lines.append(f"• {erosion_type}: {count} observations")
+    
+    risk_lines = []
+    for risk, count in risk_breakdown.items():
+        risk_lines.append(f"• {risk}: {count} observations")
+    
+    return f"""Total Observations: {len(d):,}
 
 By Erosion Type:
 {newline.join(type_lines)}
@@ -155,42 +100,27 @@ By Risk Level:
 Year Range: {year_range}
 Countries: {d['country'].nunique()} unique"""
 
-    @app.callback(
-        Output('kpi-land-at-risk-card', 'title'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_land_at_risk_hover(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        if d.empty:
-            return "No land risk data available"
-        
-        total_land_data = d[d['erosion_risk_level'] == 'Total']
-        if total_land_data.empty:
-            country_details = d.groupby('country')['obs_value'].mean().sort_values(ascending=False)
-            data_source = "calculated from risk levels"
-        else:
-            country_details = total_land_data.groupby('country')['obs_value'].mean().sort_values(ascending=False)
-            data_source = "total land measurements"
-        
-        top_countries = country_details.head(8)
-        
-        # Build strings with consistent formatting
-        newline = '\n'
-        country_lines = []
-        for country, percentage in top_countries.items():
-            country_lines.append(f"• {country}: {percentage:.1f}%")
-        
-        return f"""Agricultural Land at Risk:
+def land_at_risk_hover(d):
+    if d.empty:
+        return "No land risk data available"
+    
+    total_land_data = d[d['erosion_risk_level'] == 'Total']
+    if total_land_data.empty:
+        country_details = d.groupby('country', observed=True)['obs_value'].mean().sort_values(ascending=False)
+        data_source = "calculated from risk levels"
+    else:
+        country_details = total_land_data.groupby('country', observed=True)['obs_value'].mean().sort_values(ascending=False)
+        data_source = "total land measurements"
+    
+    top_countries = country_details.head(8)
+    
+    # Build strings with consistent formatting
+    newline = '\n'
+    country_lines = []
+    for country, percentage in top_countries.items():
+        country_lines.append(f"• {country}: {percentage:.1f}%")
+    
+    return f"""Agricultural Land at Risk:
 
 Top Countries:
 {newline.join(country_lines)}
@@ -198,40 +128,25 @@ Top Countries:
 Total countries: {len(country_details)}
 Data source: {data_source}"""
 
-    @app.callback(
-        Output('kpi-severe-risk-percent-card', 'title'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_severe_risk_percent_hover(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        if d.empty:
-            return "No data available"
-        
-        d_filtered = d[d['erosion_risk_level'] != 'Total']
-        severe_data = d_filtered[d_filtered['erosion_risk_level'] == 'Severe']
-        
-        if severe_data.empty:
-            return f"No severe risk areas in selection\nTotal observations: {len(d_filtered)}"
-        
-        severe_by_country = severe_data['country'].value_counts()
-        
-        # Build strings with consistent formatting
-        newline = '\n'
-        country_lines = []
-        for country, count in severe_by_country.head(8).items():
-            country_lines.append(f"• {country}: {count} observations")
-        
-        return f"""Severe Risk Analysis:
+def severe_risk_percent_hover(d):
+    if d.empty:
+        return "No data available"
+    
+    d_filtered = d[d['erosion_risk_level'] != 'Total']
+    severe_data = d_filtered[d_filtered['erosion_risk_level'] == 'Severe']
+    
+    if severe_data.empty:
+        return f"No severe risk areas in selection\nTotal observations: {len(d_filtered)}"
+    
+    severe_by_country = count_values(severe_data['country'])
+    
+    # Build strings with consistent formatting
+    newline = '\n'
+    country_lines = []
+    for country, count in severe_by_country.head(8).items():
+        country_lines.append(f"• {country}: {count} observations")
+    
+    return f"""Severe Risk Analysis:
 
 {len(severe_data)} severe out of {len(d_filtered)} total
 ({len(severe_data)/len(d_filtered)*100:.1f}%)
@@ -239,69 +154,88 @@ Data source: {data_source}"""
 Countries with severe risk:
 {newline.join(country_lines)}"""
 
-    @app.callback(
-        Output('kpi-high-risk-countries-card', 'title'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
-    )
-    def update_high_risk_countries_hover(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
-        
-        high_risk_indicators = ['High', 'Severe']
-        high_risk_data = d[d['erosion_risk_level'].isin(high_risk_indicators)]
-        
-        if high_risk_data.empty:
-            return "No high-risk countries found"
-        
-        # Get the complete list of high-risk countries with details
-        country_details = high_risk_data.groupby('country').agg({
-            'erosion_risk_level': lambda x: ', '.join(sorted(x.unique())),
-            'obs_value': 'mean'
-        }).round(1).sort_values('obs_value', ascending=False)
-        
-        total_countries = len(country_details)
-        high_only = len(high_risk_data[high_risk_data['erosion_risk_level'] == 'High']['country'].unique())
-        severe_count = len(high_risk_data[high_risk_data['erosion_risk_level'] == 'Severe']['country'].unique())
-        
-        # Build strings with consistent formatting
-        newline = '\n'
-        country_lines = []
-        for country, row in country_details.iterrows():
-            country_lines.append(f"• {country}: {row['obs_value']:.1f}% ({row['erosion_risk_level']})")
-        
-        return f"""High-Risk Countries ({total_countries} total):
+def high_risk_countries_hover(d):
+    high_risk_indicators = ['High', 'Severe']
+    high_risk_data = d[d['erosion_risk_level'].isin(high_risk_indicators)]
+    
+    if high_risk_data.empty:
+        return "No high-risk countries found"
+    
+    # Get the complete list of high-risk countries with details
+    country_details = high_risk_data.groupby('country', observed=True).agg({
+        'erosion_risk_level': lambda x: ', '.join(sorted(x.unique())),
+        'obs_value': 'mean'
+    }).round(1).sort_values('obs_value', ascending=False)
+    
+    total_countries = len(country_details)
+    high_only = len(high_risk_data[high_risk_data['erosion_risk_level'] == 'High']['country'].unique())
+    severe_count = len(high_risk_data[high_risk_data['erosion_risk_level'] == 'Severe']['country'].unique())
+    
+    # Build strings with consistent formatting
+    newline = '\n'
+    country_lines = []
+    for country, row in country_details.iterrows():
+        country_lines.append(f"• {country}: {row['obs_value']:.1f}% ({row['erosion_risk_level']})")
+    
+    return f"""High-Risk Countries ({total_countries} total):
 
 Complete List:
 {newline.join(country_lines)}
 
 Summary: {severe_count} severe, {high_only} high-only"""
 
+def get_erosion_callbacks(dataset, app):
+
+    # KPI cards and their hover details, all from one filtered frame
+    @app.callback(
+        [Output('kpi-total-observations', 'children'),
+         Output('kpi-land-at-risk', 'children'),
+         Output('kpi-severe-risk-percent', 'children'),
+         Output('kpi-high-risk-countries', 'children'),
+         Output('kpi-total-observations-card', 'title'),
+         Output('kpi-land-at-risk-card', 'title'),
+         Output('kpi-severe-risk-percent-card', 'title'),
+         Output('kpi-high-risk-countries-card', 'title')],
+        [Input('country-dropdown', 'value'),
+         Input('year-slider', 'value'),
+         Input('erosion-risk-dropdown', 'value'),
+         Input('erosion-type-dropdown', 'value')]
+    )
+    def update_kpis(countries, years, erosion_levels, erosion_types):
+        df = dataset.frame
+        d = filter_erosion_data(df, countries, years, erosion_levels, erosion_types)
+        return (
+            kpi_total_observations(d),
+            kpi_land_at_risk(d),
+            kpi_severe_risk_percent(d),
+            kpi_high_risk_countries(d),
+            total_observations_hover(d),
+            land_at_risk_hover(d),
+            severe_risk_percent_hover(d),
+            high_risk_countries_hover(d),
+        )
+
     # Visualization 1: Erosion Risk Evolution Over Time
     @app.callback(
         Output('erosion-temporal-evolution', 'figure'),
         Input('country-dropdown', 'value'),
         Input('year-slider', 'value'),
         Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
+        Input('erosion-type-dropdown', 'value'),
+        **background_options()
     )
+    @cached_figure(dataset, 'erosion-temporal-evolution')
     def update_erosion_temporal_evolution(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
+        df = dataset.frame
+        # Rolled up from the aggregate cube rather than the raw rows
+        temporal_data = get_cube(df).query(
+            ['year', 'measure_category'],
+            measures=erosion_measure_categories(df, erosion_types),
+            selected_countries=countries, year_range=years,
+            selected_erosion_levels=erosion_levels
+        )
         
-        if d.empty:
+        if temporal_data.empty:
             fig = go.Figure()
             fig.add_annotation(text="No data available for selected filters", 
                              xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False)
@@ -310,10 +244,7 @@ Summary: {severe_count} severe, {high_only} high-only"""
             return fig
         
         # Create temporal analysis
-        temporal_data = d.groupby(['year', 'measure_category']).agg({
-            'obs_value': ['sum', 'count', 'mean', 'std']
-        }).reset_index()
-        
+        temporal_data = temporal_data[['year', 'measure_category', 'sum', 'count', 'mean', 'std']]
         temporal_data.columns = ['year', 'measure_category', 'total_erosion', 'observation_count', 'avg_intensity', 'volatility']
         temporal_data['volatility'] = temporal_data['volatility'].fillna(0)
         
@@ -403,16 +334,13 @@ Summary: {severe_count} severe, {high_only} high-only"""
         Input('country-dropdown', 'value'),
         Input('year-slider', 'value'),
         Input('erosion-risk-dropdown', 'value'),
-        Input('erosion-type-dropdown', 'value')
+        Input('erosion-type-dropdown', 'value'),
+        **background_options()
     )
+    @cached_figure(dataset, 'erosion-geographic-matrix')
     def update_erosion_geographic_matrix_normalized(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
+        df = dataset.frame
+        d = filter_erosion_data(df, countries, years, erosion_levels, erosion_types)
         
         if d.empty:
             fig = go.Figure()
@@ -424,10 +352,10 @@ Summary: {severe_count} severe, {high_only} high-only"""
         
         # Add continent information
         if 'continent' not in d.columns:
-            d['continent'] = d['country'].apply(get_continent)
+            d = add_continent_column(d)
         
         # Prepare data for visualization
-        geo_data = d.groupby(['country', 'measure_category', 'continent']).agg({
+        geo_data = d.groupby(['country', 'measure_category', 'continent'], observed=True).agg({
             'obs_value': ['mean', 'count', 'max']
         }).reset_index()
         
@@ -459,7 +387,7 @@ Summary: {severe_count} severe, {high_only} high-only"""
         )
         
         # Left panel: Clean heatmap with top 10 normalized countries
-        top_countries = valid_geo_data.groupby('country')['avg_intensity_log_normalized'].mean().nlargest(10).index
+        top_countries = valid_geo_data.groupby('country', observed=True)['avg_intensity_log_normalized'].mean().nlargest(10).index
         heatmap_data = valid_geo_data[valid_geo_data['country'].isin(top_countries)]
         
         # Pivot for heatmap using normalized values
@@ -467,7 +395,8 @@ Summary: {severe_count} severe, {high_only} high-only"""
             index='country', 
             columns='measure_category', 
             values='avg_intensity_log_normalized', 
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
         
         # Sort countries by total normalized intensity
@@ -493,7 +422,7 @@ Summary: {severe_count} severe, {high_only} high-only"""
         )
         
         # Right panel: Continental bubble chart with normalized data
-        continent_summary = valid_geo_data.groupby('continent').agg({
+        continent_summary = valid_geo_data.groupby('continent', observed=True).agg({
             'avg_intensity_log_normalized': 'mean',
             'observation_count': 'sum',
             'country': 'nunique'
@@ -591,14 +520,10 @@ Summary: {severe_count} severe, {high_only} high-only"""
         Input('erosion-risk-dropdown', 'value'),
         Input('erosion-type-dropdown', 'value')
     )
+    @cached_figure(dataset, 'erosion-risk-patterns')
     def update_erosion_risk_patterns(countries, years, erosion_levels, erosion_types):
-        erosion_measures = df[df['measure_category'].str.contains('erosion', case=False, na=False)]
-        d = apply_filters(erosion_measures, selected_countries=countries, year_range=years, 
-                         selected_erosion_levels=erosion_levels)
-        
-        # Apply erosion type filter
-        if erosion_types and 'All' not in erosion_types:
-            d = d[d['measure_category'].isin(erosion_types)]
+        df = dataset.frame
+        d = filter_erosion_data(df, countries, years, erosion_levels, erosion_types)
         
         if d.empty:
             fig = go.Figure()
@@ -610,7 +535,7 @@ Summary: {severe_count} severe, {high_only} high-only"""
         
         # Add continent information
         if 'continent' not in d.columns:
-            d['continent'] = d['country'].apply(get_continent)
+            d = add_continent_column(d)
         
         # Risk Distribution Matrix
         fig = go.Figure()
@@ -619,7 +544,7 @@ Summary: {severe_count} severe, {high_only} high-only"""
         d_filtered = d[d['erosion_risk_level'].str.lower() != 'total']
         
         # Prepare data
-        risk_summary = d_filtered.groupby(['erosion_risk_level', 'measure_category']).agg({
+        risk_summary = d_filtered.groupby(['erosion_risk_level', 'measure_category'], observed=True).agg({
             'obs_value': ['mean', 'count', 'std']
         }).reset_index()
         
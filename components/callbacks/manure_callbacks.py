@@ -2,64 +2,44 @@ from dash import Input, Output
 import plotly.express as px
 from dash import html, dcc
 
+from ..helpers.cube import get_cube
+from ..helpers.figure_cache import cached_figure
 from ..helpers.get_continent import get_continent
+from ..helpers.subsets import MANURE_MEASURES, get_subset, measures_where
 from ..helpers.tools import apply_filters, style_title, normalize_by_agricultural_land
 from ..styles import CHART_TITLE_CONFIG, VIZ_COLOR, TEXT_COLOR, FONT_FAMILY
 
-def get_manure_callbacks(df, app):
+def get_manure_callbacks(dataset, app):
     @app.callback(
-        Output('kpi-total-manure', 'children'),
+        [Output('kpi-total-manure', 'children'),
+         Output('kpi-avg-net-input', 'children'),
+         Output('kpi-pct-manure', 'children'),
+         Output('kpi-top-country', 'children')],
         Input('country-dropdown', 'value'),
         Input('year-slider', 'value'),
         Input('nutrient-dropdown', 'value')
     )
-    def update_total_manure(countries, years, nutrients):
+    def update_kpis(countries, years, nutrients):
+        df = dataset.frame
         d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients)
-        total = d.loc[d['measure_category']=='Livestock manure production', 'obs_value'].sum()
 
-        return f"{total:,.0f}"
+        total_manure = d.loc[d['measure_category']=='Livestock manure production', 'obs_value'].sum()
 
-    @app.callback(
-        Output('kpi-avg-net-input', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('nutrient-dropdown', 'value')
-    )
-    def update_avg_net(countries, years, nutrients):
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients)
-        avg = d.loc[d['measure_category']=='Net input of manure', 'obs_value'].mean()
+        net_input = d.loc[d['measure_category']=='Net input of manure']
+        avg = net_input['obs_value'].mean()
 
-        return f"{avg:,.2f}"
-
-    @app.callback(
-        Output('kpi-pct-manure', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('nutrient-dropdown', 'value')
-    )
-    def update_pct_manure(countries, years, nutrients):
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients)
         total = d['obs_value'].sum()
-        manure = d.loc[d['measure_category'].str.contains('manure|livestock', case=False), 'obs_value'].sum()
-
+        manure = d.loc[d['measure_category'].isin(measures_where(df, 'is_manure_related')), 'obs_value'].sum()
         pct = (manure/total*100) if total else 0
 
-        return f"{pct:.1f}%"
-
-    @app.callback(
-        Output('kpi-top-country', 'children'),
-        Input('country-dropdown', 'value'),
-        Input('year-slider', 'value'),
-        Input('nutrient-dropdown', 'value')
-    )
-    def update_top_country(countries, years, nutrients):
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients)
-        grp = d.loc[d['measure_category']=='Net input of manure'].groupby('country')['obs_value'].sum()
+        grp = net_input.groupby('country', observed=True)['obs_value'].sum()
         if grp.empty:
-            return html.Div([html.H4("Top Country by Net Input"), html.P("N/A")])
-        country = grp.idxmax(); val = grp.max()
+            top_country = html.Div([html.H4("Top Country by Net Input"), html.P("N/A")])
+        else:
+            country = grp.idxmax(); val = grp.max()
+            top_country = f"{country}: {val:,.0f}"
 
-        return f"{country}: {val:,.0f}"
+        return f"{total_manure:,.0f}", f"{avg:,.2f}", f"{pct:.1f}%", top_country
 
     @app.callback(
         Output('manure-globe', 'figure'),
@@ -67,13 +47,12 @@ def get_manure_callbacks(df, app):
         Input('year-slider', 'value'),
         Input('nutrient-dropdown', 'value')
     )
+    @cached_figure(dataset, 'manure-globe')
     def plot_manure_globe(countries, years, nutrients):
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients)
-
-        cats = ['Manure management', 'Manure imports', 'Manure withdrawals', 'Net input of manure', 'Livestock manure production', 'Organic fertilisers (excluding livestock manure)']
-        d = d[d['measure_category'].isin(cats)]
-        d = d.groupby('country', as_index=False)['obs_value'].sum()
-        d['obs_value'] = d['obs_value'].round(0)
+        df = dataset.frame
+        d = get_cube(df).query('country', measures=MANURE_MEASURES, selected_countries=countries,
+                               year_range=years, selected_nutrients=nutrients)
+        d = d[['country']].assign(obs_value=d['sum'].round(0))
 
         raw_title = 'Manure-related Categories by Country'
 
@@ -117,9 +96,10 @@ def get_manure_callbacks(df, app):
     Input('year-slider', 'value'),
     Input('nutrient-dropdown', 'value')
     )
+    @cached_figure(dataset, 'manure-ecdf')
     def update_manure_ecdf(countries, years, nutrients):
-        cats = ['Manure management', 'Manure imports', 'Manure withdrawals', 'Net input of manure', 'Livestock manure production', 'Organic fertilisers (excluding livestock manure)']
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients, selected_categories=cats)
+        df = dataset.frame
+        d = apply_filters(get_subset(df, 'manure'), selected_countries=countries, year_range=years, selected_nutrients=nutrients)
 
         # d_cat = d.groupby(['year', 'measure_category'], as_index=False)['obs_value'].sum()
 
@@ -152,23 +132,16 @@ def get_manure_callbacks(df, app):
         Input('year-slider', 'value'),
         Input('nutrient-dropdown', 'value')
     )
+    @cached_figure(dataset, 'manure-chartie')
     def update_manure_bar_normalized(countries, years, nutrients):
+        df = dataset.frame
         import numpy as np
 
-        cats = [
-            'Manure management',
-            'Manure imports',
-            'Manure withdrawals',
-            'Net input of manure',
-            'Livestock manure production',
-            'Organic fertilisers (excluding livestock manure)'
-        ]
-
         # Filter data
-        d = apply_filters(df, selected_countries=countries, year_range=years, selected_nutrients=nutrients, selected_categories=cats)
+        d = apply_filters(get_subset(df, 'manure'), selected_countries=countries, year_range=years, selected_nutrients=nutrients)
 
         # Aggregate by country
-        d_country = d.groupby('country', as_index=False)['obs_value'].sum()
+        d_country = d.groupby('country', as_index=False, observed=True)['obs_value'].sum()
 
         # Normalize using your provided function
         d_country = normalize_by_agricultural_land(d_country, df, value_column='obs_value')
@@ -209,7 +182,9 @@ def get_manure_callbacks(df, app):
         Input('year-slider', 'value'),
         Input('nutrient-dropdown', 'value')
     )
+    @cached_figure(dataset, 'manure-baby')
     def update_manure_sunburst(countries, years, nutrients):
+        df = dataset.frame
         cats = [
             'Manure management',
             'Manure imports',
@@ -219,7 +194,7 @@ def get_manure_callbacks(df, app):
         ]
 
         d = apply_filters(
-            df,
+            get_subset(df, 'manure'),
             selected_countries=countries,
             year_range=years,
             selected_nutrients=nutrients,
@@ -227,7 +202,7 @@ def get_manure_callbacks(df, app):
         )
 
         # Aggregate just by category (you can add more hierarchy if you want)
-        d_grouped = d.groupby('measure_category', as_index=False)['obs_value'].sum()
+        d_grouped = d.groupby('measure_category', as_index=False, observed=True)['obs_value'].sum()
         d_grouped['root'] = 'Manure'
 
         raw_title = 'Manure Categories Overview'
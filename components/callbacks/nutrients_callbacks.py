@@ -2,62 +2,66 @@ from dash import Input, Output
 import plotly.express as px
 from dash import html, dcc
 import pandas as pd
+from .. import config
+from ..helpers.figure_cache import cached_figure
+from ..helpers.serialization import columns_payload
+from ..helpers.subsets import get_subset
 from ..helpers.tools import apply_filters, style_title, normalize_by_agricultural_land
 from ..styles import CHART_TITLE_CONFIG, VIZ_COLOR, TEXT_COLOR, FONT_FAMILY
 import json
 
-def get_nutrients_callbacks(df, app):
+def get_nutrients_callbacks(dataset, app):
     # =========================================================================
-    # KPI: Avg Nitrogen (Normalized)
+    # KPIs: Avg Nitrogen / Avg Phosphorus (Normalized)
     # =========================================================================
-    @app.callback(
-        Output('avg-nitrogen', 'children'),
-        [
-            Input('country-dropdown','value'),
-            Input('year-slider', 'value'),
-            Input('nutrient-dropdown', 'value'),
-            Input('category-dropdown', 'value'),
-            Input('status-dropdown', 'value')
-        ]
-    )
-    def update_avg_nitrogen(countries, years, nutrients, categories, status):
-        filtered = apply_filters(df, selected_countries=countries, year_range=years, 
-                                 selected_nutrients=nutrients, selected_categories=categories, 
-                                 selected_status=status)
-        nitrogen_balance = filtered[
-            (filtered['nutrients'] == "Nitrogen") &
-            (filtered['measure_category'] == "Balance (inputs minus outputs)")
-        ]
-        if nitrogen_balance.empty:
-            return "0"
-        nitrogen_balance = normalize_by_agricultural_land(nitrogen_balance, df, "obs_value")
-        return f"{nitrogen_balance['obs_value_log_normalized'].mean():,.2f}"
+    if config.CLIENTSIDE:
+        app.clientside_callback(
+            """
+            function(countries, years, nutrients, categories, status, extract) {
+                return window.dashboardExtracts.nutrientsKpis(extract, countries, years, nutrients, categories, status);
+            }
+            """,
+            [
+                Output('avg-nitrogen', 'children'),
+                Output('avg-phosphorus', 'children')
+            ],
+            [
+                Input('country-dropdown','value'),
+                Input('year-slider', 'value'),
+                Input('nutrient-dropdown', 'value'),
+                Input('category-dropdown', 'value'),
+                Input('status-dropdown', 'value')
+            ],
+            Input('nutrients-extract', 'data')
+        )
+    else:
+        @app.callback(
+            [
+                Output('avg-nitrogen', 'children'),
+                Output('avg-phosphorus', 'children')
+            ],
+            [
+                Input('country-dropdown','value'),
+                Input('year-slider', 'value'),
+                Input('nutrient-dropdown', 'value'),
+                Input('category-dropdown', 'value'),
+                Input('status-dropdown', 'value')
+            ]
+        )
+        def update_kpis(countries, years, nutrients, categories, status):
+            df = dataset.frame
+            balance = apply_filters(get_subset(df, 'nutrient_balance'), selected_countries=countries, year_range=years, 
+                                    selected_nutrients=nutrients, selected_categories=categories, 
+                                    selected_status=status)
 
-    # =========================================================================
-    # KPI: Avg Phosphorus (Normalized)
-    # =========================================================================
-    @app.callback(
-        Output('avg-phosphorus','children'),
-        [
-            Input('category-dropdown', 'value'),
-            Input('year-slider', 'value'),
-            Input('nutrient-dropdown','value'),
-            Input('country-dropdown','value'),
-            Input('status-dropdown','value')
-        ]
-    )
-    def update_avg_phosphorus(categories, years, nutrients, countries, status):
-        filtered = apply_filters(df, selected_countries=countries, year_range=years, 
-                                 selected_nutrients=nutrients, selected_categories=categories,
-                                 selected_status=status)
-        phosphorus_balance = filtered[
-            (filtered['nutrients'] == "Phosphorus") &
-            (filtered['measure_category'] == "Balance (inputs minus outputs)")
-        ]
-        if phosphorus_balance.empty:
-            return "0"
-        phosphorus_balance = normalize_by_agricultural_land(phosphorus_balance, df, "obs_value")
-        return f"{phosphorus_balance['obs_value_log_normalized'].mean():,.2f}"
+            def avg_normalized_balance(nutrient):
+                nutrient_balance = balance[balance['nutrients'] == nutrient]
+                if nutrient_balance.empty:
+                    return "0"
+                nutrient_balance = normalize_by_agricultural_land(nutrient_balance, df, "obs_value")
+                return f"{nutrient_balance['obs_value_log_normalized'].mean():,.2f}"
+
+            return avg_normalized_balance("Nitrogen"), avg_normalized_balance("Phosphorus")
 
     # =========================================================================
     # Dual Line Chart (Normalized)
@@ -72,7 +76,9 @@ def get_nutrients_callbacks(df, app):
             Input('status-dropdown', 'value')
         ]
     )
+    @cached_figure(dataset, 'dual-line-chart')
     def update_dual_line_chart(categories, years, nutrients, countries, status):
+        df = dataset.frame
         d = apply_filters(df, selected_categories=categories, year_range=years,
                           selected_nutrients=nutrients, selected_countries=countries,
                           selected_status=status)
@@ -81,8 +87,8 @@ def get_nutrients_callbacks(df, app):
             return px.line(title="Inputs/Outputs Over Time (No Data)")
 
         d = normalize_by_agricultural_land(d, df, "obs_value")
-        d_grouped = d.groupby(['year', 'nutrients', 'measure_category'], as_index=False)['obs_value_log_normalized'].mean()
-        d_grouped['label'] = d_grouped['nutrients'] + ' - ' + d_grouped['measure_category']
+        d_grouped = d.groupby(['year', 'nutrients', 'measure_category'], as_index=False, observed=True)['obs_value_log_normalized'].mean()
+        d_grouped['label'] = d_grouped['nutrients'].astype(str) + ' - ' + d_grouped['measure_category'].astype(str)
 
         fig = px.line(d_grouped, x='year', y='obs_value_log_normalized', color='label', markers=True,
                       title=style_title(f"Normalized Inputs/Outputs Over Time ({years[0]}–{years[1]})"))
@@ -106,7 +112,9 @@ def get_nutrients_callbacks(df, app):
             Input('status-dropdown', 'value')
         ]
     )
+    @cached_figure(dataset, 'scatter-nitrogen-input-output')
     def update_scatter_nitrogen_io(categories, years, nutrients, countries, status):
+        df = dataset.frame
         d = apply_filters(df, selected_categories=categories, year_range=years,
                           selected_nutrients=nutrients, selected_countries=countries,
                           selected_status=status)
@@ -116,7 +124,7 @@ def get_nutrients_callbacks(df, app):
 
         d = normalize_by_agricultural_land(d, df, "obs_value")
         pivot = d.pivot_table(index='country', columns='measure_category',
-                              values='obs_value_log_normalized', aggfunc='mean').dropna()
+                              values='obs_value_log_normalized', aggfunc='mean', observed=True).dropna()
 
         fig = px.scatter(pivot, x='Nutrient inputs', y='Nutrient outputs', text=pivot.index,
                          labels={'Nutrient inputs': 'Nitrogen Input (Normalized)',
@@ -141,16 +149,17 @@ def get_nutrients_callbacks(df, app):
             Input('status-dropdown', 'value')
         ]
     )
+    @cached_figure(dataset, 'avg-balance-bar-chart')
     def update_avg_balance_bar(categories, years, nutrients, countries, status):
-        d = apply_filters(df, selected_categories=categories, year_range=years,
+        df = dataset.frame
+        d = apply_filters(get_subset(df, 'nutrient_balance'), selected_categories=categories, year_range=years,
                           selected_nutrients=nutrients, selected_countries=countries,
                           selected_status=status)
-        d = d[d['measure_category'] == 'Balance (inputs minus outputs)']
         if d.empty:
             return px.bar(title="No Data Available")
 
         d = normalize_by_agricultural_land(d, df, "obs_value")
-        d_grouped = d.groupby(['country', 'nutrients'], as_index=False)['obs_value_log_normalized'].mean()
+        d_grouped = d.groupby(['country', 'nutrients'], as_index=False, observed=True)['obs_value_log_normalized'].mean()
 
         fig = px.bar(d_grouped, x='country', y='obs_value_log_normalized', color='nutrients', barmode='group',
                      labels={'obs_value_log_normalized': 'Normalized Balance', 'nutrients': 'Nutrient'},
@@ -163,190 +172,77 @@ def get_nutrients_callbacks(df, app):
     # =========================================================================
     # D3 Chart Data Callback (Normalized)
     # =========================================================================
-    @app.callback(
-        Output("nutrients-d3-data", "data"),
-        [
-            Input('category-dropdown', 'value'),
-            Input('year-slider', 'value'),
-            Input('nutrient-dropdown', 'value'),
-            Input('country-dropdown', 'value'),
-            Input('status-dropdown', 'value')
-        ]
-    )
-    def update_d3_data(categories, years, nutrients, countries, status):
-        # Filter dataset
-        filtered = apply_filters(
-            df,
-            selected_categories=categories,
-            year_range=years,
-            selected_nutrients=nutrients,
-            selected_countries=countries,
-            selected_status=status
+    if config.CLIENTSIDE:
+        app.clientside_callback(
+            """
+            function(categories, years, nutrients, countries, status, extract) {
+                return window.dashboardExtracts.nutrientsFlows(extract, categories, years, nutrients, countries, status);
+            }
+            """,
+            Output("nutrients-d3-data", "data"),
+            [
+                Input('category-dropdown', 'value'),
+                Input('year-slider', 'value'),
+                Input('nutrient-dropdown', 'value'),
+                Input('country-dropdown', 'value'),
+                Input('status-dropdown', 'value')
+            ],
+            Input('nutrients-extract', 'data')
         )
-
-        # Keep only Inputs & Outputs
-        filtered = filtered[filtered["measure_category"].isin(["Nutrient inputs", "Nutrient outputs"])]
-
-        if filtered.empty:
-            return []
-
-        # Normalize values
-        filtered = normalize_by_agricultural_land(filtered, df, "obs_value")
-
-        # Group by country & measure_category
-        grouped = (
-            filtered.groupby(['country', 'measure_category'], as_index=False)['obs_value_log_normalized']
-            .mean()
-            .pivot(index='country', columns='measure_category', values='obs_value_log_normalized')
-            .reset_index()
-            .fillna(0)
+    else:
+        @app.callback(
+            Output("nutrients-d3-data", "data"),
+            [
+                Input('category-dropdown', 'value'),
+                Input('year-slider', 'value'),
+                Input('nutrient-dropdown', 'value'),
+                Input('country-dropdown', 'value'),
+                Input('status-dropdown', 'value')
+            ]
         )
-
-        # Rename columns for clarity
-        grouped = grouped.rename(columns={
-            "Nutrient inputs": "inputs",
-            "Nutrient outputs": "outputs"
-        })
-
-        return grouped.to_dict(orient="records")
+        def update_d3_data(categories, years, nutrients, countries, status):
+            df = dataset.frame
+            # Filter dataset
+            filtered = apply_filters(
+                df,
+                selected_categories=categories,
+                year_range=years,
+                selected_nutrients=nutrients,
+                selected_countries=countries,
+                selected_status=status
+            )
+
+            # Keep only Inputs & Outputs
+            filtered = filtered[filtered["measure_category"].isin(["Nutrient inputs", "Nutrient outputs"])]
+
+            if filtered.empty:
+                return []
+
+            # Normalize values
+            filtered = normalize_by_agricultural_land(filtered, df, "obs_value")
+
+            # Group by country & measure_category
+            grouped = (
+                filtered.groupby(['country', 'measure_category'], as_index=False, observed=True)['obs_value_log_normalized']
+                .mean()
+                .pivot(index='country', columns='measure_category', values='obs_value_log_normalized')
+                .reset_index()
+                .fillna(0)
+            )
+
+            # Rename columns for clarity
+            grouped = grouped.rename(columns={
+                "Nutrient inputs": "inputs",
+                "Nutrient outputs": "outputs"
+            })
+
+            return columns_payload(grouped)
 
     # =========================================================================
     app.clientside_callback(
         """
         function(data) {
-            if (!data || !Array.isArray(data) || data.length === 0) {
-                const container = document.getElementById('nutrients-d3-container');
-                container.innerHTML = '<div style="display:flex;justify-content:center;align-items:center;height:100%;color:#fff;">No data available</div>';
-                return "0";
-            }
-
-            // Prepare grouped data: [{country, measure, value}]
-            let grouped = [];
-            data.forEach(d => {
-                grouped.push({ country: d.country, measure: "Inputs", value: d.inputs });
-                grouped.push({ country: d.country, measure: "Outputs", value: d.outputs });
-            });
-
-            // Load D3 if not already
-            function loadD3() {
-                return new Promise((resolve, reject) => {
-                    if (typeof d3 !== 'undefined') { resolve(); return; }
-                    const script = document.createElement('script');
-                    script.src = 'https://cdnjs.cloudflare.com/ajax/libs/d3/7.8.5/d3.min.js';
-                    script.onload = () => resolve();
-                    script.onerror = () => reject(new Error('Failed to load D3.js'));
-                    document.head.appendChild(script);
-                });
-            }
-
-            function renderChart() {
-                const container = d3.select('#nutrients-d3-container');
-                container.selectAll('*').remove();
-
-                const margin = { top: 30, right: 30, bottom: 150, left: 80 };
-                const width = container.node().getBoundingClientRect().width - margin.left - margin.right;
-                const height = 350;
-
-                const svg = container.append('svg')
-                    .attr('width', width + margin.left + margin.right)
-                    .attr('height', height + margin.top + margin.bottom)
-                .append('g')
-                    .attr('transform', `translate(${margin.left},${margin.top})`);
-
-                const x0 = d3.scaleBand()
-                    .domain([...new Set(grouped.map(d => d.country))])
-                    .range([0, width])
-                    .paddingInner(0.2);
-
-                const x1 = d3.scaleBand()
-                    .domain(["Inputs", "Outputs"])
-                    .range([0, x0.bandwidth()])
-                    .padding(0.05);
-
-                const y = d3.scaleLinear()
-                    .domain([0, d3.max(grouped, d => d.value) * 1.1])
-                    .nice()
-                    .range([height, 0]);
-
-                const color = d3.scaleOrdinal()
-                    .domain(["Inputs", "Outputs"])
-                    .range(["#3498db", "#e74c3c"]);
-
-                // Tooltip
-                const tooltip = d3.select('body').append('div')
-                    .attr('class', 'd3-tooltip')
-                    .style('position', 'absolute')
-                    .style('background', 'rgba(0,0,0,0.8)')
-                    .style('color', '#fff')
-                    .style('padding', '8px')
-                    .style('border-radius', '4px')
-                    .style('visibility', 'hidden');
-
-                // Draw bars
-                svg.selectAll("g")
-                    .data(grouped.reduce((acc, d) => {
-                        let found = acc.find(a => a.country === d.country);
-                        if (!found) acc.push({ country: d.country, values: [] });
-                        acc.find(a => a.country === d.country).values.push(d);
-                        return acc;
-                    }, []))
-                    .enter()
-                    .append("g")
-                    .attr("transform", d => `translate(${x0(d.country)},0)`)
-                    .selectAll("rect")
-                    .data(d => d.values)
-                    .enter().append("rect")
-                    .attr("x", d => x1(d.measure))
-                    .attr("y", height)
-                    .attr("width", x1.bandwidth())
-                    .attr("height", 0)
-                    .attr("fill", d => color(d.measure))
-                    .on('mouseover', (event, d) => {
-                        tooltip.style('visibility', 'visible')
-                            .html(`<b>${d.country}</b><br>${d.measure}: ${d.value.toFixed(2)}`);
-                    })
-                    .on('mousemove', event => {
-                        tooltip.style('top', (event.pageY - 20) + 'px')
-                            .style('left', (event.pageX + 10) + 'px');
-                    })
-                    .on('mouseout', () => tooltip.style('visibility', 'hidden'))
-                    .transition()
-                    .duration(1000)
-                    .attr("y", d => y(d.value))
-                    .attr("height", d => height - y(d.value));
-
-                // Axes
-                svg.append('g')
-                    .attr('transform', `translate(0,${height})`)
-                    .call(d3.axisBottom(x0))
-                    .selectAll('text')
-                    .attr('transform', 'rotate(-45)')
-                    .style('text-anchor', 'end')
-                    .style('fill', '#fff');
-
-                svg.append('g').call(d3.axisLeft(y)).selectAll('text').style('fill', '#fff');
-
-                // Legend
-                const legend = svg.append("g")
-                    .attr("transform", `translate(${width - 120}, 0)`);
-
-                ["Inputs", "Outputs"].forEach((key, i) => {
-                    legend.append("rect")
-                        .attr("x", 0)
-                        .attr("y", i * 20)
-                        .attr("width", 15)
-                        .attr("height", 15)
-                        .attr("fill", color(key));
-                    legend.append("text")
-                        .attr("x", 20)
-                        .attr("y", i * 20 + 12)
-                        .text(key)
-                        .style("fill", "#fff")
-                        .style("font-size", "12px");
-                });
-            }
-
-            return loadD3().then(renderChart).then(() => data.length.toString());
+            return window.dashboardCharts.nutrientsGroupedBars('nutrients-d3-container', data);
         }
         """,
         Output('nutrients-d3-trigger', 'children'),
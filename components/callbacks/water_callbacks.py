@@ -1,35 +1,19 @@
-from dash import Input, Output
+from dash import Input, Output, State
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 from ..styles import VIZ_COLOR, TEXT_COLOR
-from ..helpers.tools import normalize_by_agricultural_land
+from ..helpers.background import background_options
+from ..helpers.figure_cache import cached_figure
+from ..helpers.patching import patch_figure, signature_store_id
+from ..helpers.serialization import columns_payload
+from ..helpers.subsets import get_subset
+from ..helpers.tools import apply_filters, normalize_by_agricultural_land
 
 def filter_water_data(df, countries, years, water_types, contamination_types):
-    # Filter for water-related measures
-    water_measures = [
-        'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for nitrate',
-        'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for phosphorus', 
-        'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for pesticides',
-        'Share of monitoring sites in agricultural areas where one or more pesticides are present',
-        'Agriculture freshwater abstraction',
-        'Total freshwater abstraction'
-    ]
-    
-    filtered_df = df[df['measure_category'].isin(water_measures)].copy()
-    
-    # Apply filters
-    if countries and 'All' not in countries:
-        filtered_df = filtered_df[filtered_df['country'].isin(countries)]
-    
-    if years:
-        filtered_df = filtered_df[
-            (filtered_df['year'] >= years[0]) & 
-            (filtered_df['year'] <= years[1])
-        ]
-    
-    if water_types and 'All' not in water_types:
-        filtered_df = filtered_df[filtered_df['water_type'].isin(water_types)]
+    # Water-related measures, with their flag columns precomputed
+    filtered_df = apply_filters(get_subset(df, 'water'), selected_countries=countries,
+                                year_range=years, selected_water_types=water_types)
     
     # Filter by contamination type
     if contamination_types and 'All' not in contamination_types:
@@ -45,121 +29,98 @@ def filter_water_data(df, countries, years, water_types, contamination_types):
         
         if contamination_filter:
             contamination_data = filtered_df[filtered_df['measure_category'].isin(contamination_filter)]
-            abstraction_data = filtered_df[filtered_df['measure_category'].str.contains('abstraction')]
+            abstraction_data = filtered_df[filtered_df['is_abstraction']]
             filtered_df = pd.concat([contamination_data, abstraction_data])
     
     return filtered_df
 
-def get_water_callbacks(df, app):
-    
-    @app.callback(
-        [Output('kpi-high-contamination-countries', 'children'),
-         Output('kpi-avg-contamination-rate', 'children'),
-         Output('kpi-total-water-abstraction', 'children'),
-         Output('kpi-worst-contamination-type', 'children')],
-        [Input('country-dropdown', 'value'),
-         Input('year-slider', 'value'),
-         Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
-    )
-    def update_kpis(countries, years, water_types, contamination_types):
-        try:
-            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
-            
-            # KPI 1: High Risk Countries (>30% contamination)
-            contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', na=False)
-            ]
-            if not contamination_data.empty:
-                country_avg = contamination_data.groupby('country')['obs_value'].mean()
-                high_risk_countries = (country_avg > 30).sum()
-            else:
-                high_risk_countries = 0
-            
-            # KPI 2: Average Contamination Rate
-            if not contamination_data.empty:
-                avg_contamination = contamination_data['obs_value'].mean()
-                kpi2_value = f"{avg_contamination:.1f}%"
-            else:
-                kpi2_value = "0%"
-            
-            # KPI 3: Total Agricultural Water Use (latest year)
-            abstraction_data = filtered_df[
-                filtered_df['measure_category'] == 'Agriculture freshwater abstraction'
-            ]
-            if not abstraction_data.empty:
-                latest_year = abstraction_data['year'].max()
-                latest_data = abstraction_data[abstraction_data['year'] == latest_year]
-                total_abstraction = latest_data['obs_value'].sum()
-                if total_abstraction >= 1000000:
-                    kpi3_value = f"{total_abstraction/1000000:.1f}M"
-                elif total_abstraction >= 1000:
-                    kpi3_value = f"{total_abstraction/1000:.1f}K"
-                else:
-                    kpi3_value = f"{total_abstraction:.0f}"
+def water_kpis(filtered_df):
+    try:
+        # KPI 1: High Risk Countries (>30% contamination)
+        contamination_data = filtered_df[
+            filtered_df['exceeds_limits']
+        ]
+        if not contamination_data.empty:
+            country_avg = contamination_data.groupby('country', observed=True)['obs_value'].mean()
+            high_risk_countries = (country_avg > 30).sum()
+        else:
+            high_risk_countries = 0
+        
+        # KPI 2: Average Contamination Rate
+        if not contamination_data.empty:
+            avg_contamination = contamination_data['obs_value'].mean()
+            kpi2_value = f"{avg_contamination:.1f}%"
+        else:
+            kpi2_value = "0%"
+        
+        # KPI 3: Total Agricultural Water Use (latest year)
+        abstraction_data = filtered_df[
+            filtered_df['is_agriculture_abstraction']
+        ]
+        if not abstraction_data.empty:
+            latest_year = abstraction_data['year'].max()
+            latest_data = abstraction_data[abstraction_data['year'] == latest_year]
+            total_abstraction = latest_data['obs_value'].sum()
+            if total_abstraction >= 1000000:
+                kpi3_value = f"{total_abstraction/1000000:.1f}M"
+            elif total_abstraction >= 1000:
+                kpi3_value = f"{total_abstraction/1000:.1f}K"
             else:
-                kpi3_value = "0"
-            
-            # KPI 4: Worst Contamination Type
-            if not contamination_data.empty:
-                contamination_by_type = contamination_data.groupby('measure_category')['obs_value'].mean()
-                worst_type = contamination_by_type.idxmax()
-                if 'nitrate' in worst_type.lower():
-                    kpi4_value = "Nitrate"
-                elif 'phosphorus' in worst_type.lower():
-                    kpi4_value = "Phosphorus"
-                elif 'pesticide' in worst_type.lower():
-                    kpi4_value = "Pesticides"
-                else:
-                    kpi4_value = "Unknown"
+                kpi3_value = f"{total_abstraction:.0f}"
+        else:
+            kpi3_value = "0"
+        
+        # KPI 4: Worst Contamination Type
+        if not contamination_data.empty:
+            contamination_by_type = contamination_data.groupby('measure_category', observed=True)['obs_value'].mean()
+            worst_type = contamination_by_type.idxmax()
+            if 'nitrate' in worst_type.lower():
+                kpi4_value = "Nitrate"
+            elif 'phosphorus' in worst_type.lower():
+                kpi4_value = "Phosphorus"
+            elif 'pesticide' in worst_type.lower():
+                kpi4_value = "Pesticides"
             else:
-                kpi4_value = "N/A"
-            
-            return (str(high_risk_countries), kpi2_value, kpi3_value, kpi4_value)
-            
-        except Exception as e:
-            return ("0", "0%", "0", "N/A")
+                kpi4_value = "Unknown"
+        else:
+            kpi4_value = "N/A"
+        
+        return (str(high_risk_countries), kpi2_value, kpi3_value, kpi4_value)
+        
+    except Exception as e:
+        return ("0", "0%", "0", "N/A")
 
-    # HOVER DETAIL CALLBACKS FOR KPI CARDS
-    @app.callback(
-        Output('kpi-high-contamination-countries-card', 'title'),
-        [Input('country-dropdown', 'value'),
-         Input('year-slider', 'value'),
-         Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
-    )
-    def update_high_risk_countries_hover(countries, years, water_types, contamination_types):
-        try:
-            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
-            
-            contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', na=False)
-            ]
-            
-            if contamination_data.empty:
-                return "No contamination data available for selected filters"
-            
-            # Get country averages and identify high-risk countries
-            country_avg = contamination_data.groupby('country')['obs_value'].mean().sort_values(ascending=False)
-            high_risk_countries = country_avg[country_avg > 30]
-            total_countries = len(country_avg)
-            
-            # Get breakdown by contamination type
-            type_breakdown = contamination_data.groupby('measure_category')['country'].nunique()
-            year_range = f"{contamination_data['year'].min()}-{contamination_data['year'].max()}" if contamination_data['year'].nunique() > 1 else str(contamination_data['year'].iloc[0])
-            
-            # Build strings with consistent formatting
-            newline = '\n'
-            country_lines = []
-            for country, rate in high_risk_countries.head(8).items():
-                country_lines.append(f"• {country}: {rate:.1f}% contamination")
-            
-            type_lines = []
-            for measure_type, count in type_breakdown.items():
-                simplified_type = measure_type.split('for ')[-1].replace('nitrate', 'Nitrate').replace('phosphorus', 'Phosphorus').replace('pesticides', 'Pesticides')
-                type_lines.append(f"• {simplified_type}: {count} countries monitored")
-            
-            return f"""High-Risk Countries (>30% contamination): {len(high_risk_countries)} out of {total_countries}
+# HOVER DETAILS FOR KPI CARDS
+def high_risk_countries_hover(filtered_df):
+    try:
+        contamination_data = filtered_df[
+            filtered_df['exceeds_limits']
+        ]
+        
+        if contamination_data.empty:
+            return "No contamination data available for selected filters"
+        
+        # Get country averages and identify high-risk countries
+        country_avg = contamination_data.groupby('country', observed=True)['obs_value'].mean().sort_values(ascending=False)
+        high_risk_countries = country_avg[country_avg > 30]
+        total_countries = len(country_avg)
+        
+        # Get breakdown by contamination type
+        type_breakdown = contamination_data.groupby('measure_category', observed=True)['country'].nunique()
+        year_range = f"{contamination_data['year'].min()}-{contamination_data['year'].max()}" if contamination_data['year'].nunique() > 1 else str(contamination_data['year'].iloc[0])
+        
+        # Build strings with consistent formatting
+        newline = '\n'
+        country_lines = []
+        for country, rate in high_risk_countries.head(8).items():
+            country_lines.append(f"• {country}: {rate:.1f}% contamination")
+        
+        type_lines = []
+        for measure_type, count in type_breakdown.items():
+            simplified_type = measure_type.split('for ')[-1].replace('nitrate', 'Nitrate').replace('phosphorus', 'Phosphorus').replace('pesticides', 'Pesticides')
+            type_lines.append(f"• {simplified_type}: {count} countries monitored")
+        
+        return f"""High-Risk Countries (>30% contamination): {len(high_risk_countries)} out of {total_countries}
 
 Countries with Highest Risk:
 {newline.join(country_lines)}
@@ -169,46 +130,37 @@ Monitoring Coverage by Type:
 
 Data Period: {year_range}
 Threshold: >30% of monitoring sites exceed drinking water limits"""
-            
-        except Exception as e:
-            return "Error loading high-risk countries data"
+        
+    except Exception as e:
+        return "Error loading high-risk countries data"
 
-    @app.callback(
-        Output('kpi-avg-contamination-rate-card', 'title'),
-        [Input('country-dropdown', 'value'),
-         Input('year-slider', 'value'),
-         Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
-    )
-    def update_avg_contamination_hover(countries, years, water_types, contamination_types):
-        try:
-            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
-            
-            contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', na=False)
-            ]
-            
-            if contamination_data.empty:
-                return "No contamination data available"
-            
-            # Calculate detailed statistics
-            overall_avg = contamination_data['obs_value'].mean()
-            by_type = contamination_data.groupby('measure_category')['obs_value'].agg(['mean', 'count']).round(1)
-            by_water_type = contamination_data.groupby('water_type')['obs_value'].agg(['mean', 'count']).round(1)
-            
-            # Build strings with consistent formatting
-            newline = '\n'
-            type_lines = []
-            for measure_type, stats in by_type.iterrows():
-                simplified_type = measure_type.split('for ')[-1].replace('nitrate', 'Nitrate').replace('phosphorus', 'Phosphorus').replace('pesticides', 'Pesticides')
-                type_lines.append(f"• {simplified_type}: {stats['mean']:.1f}% ({int(stats['count'])} sites)")
-            
-            water_lines = []
-            for water_type, stats in by_water_type.iterrows():
-                if water_type != 'Not applicable':
-                    water_lines.append(f"• {water_type}: {stats['mean']:.1f}% ({int(stats['count'])} sites)")
-            
-            return f"""Average Contamination Rate: {overall_avg:.1f}%
+def avg_contamination_hover(filtered_df):
+    try:
+        contamination_data = filtered_df[
+            filtered_df['exceeds_limits']
+        ]
+        
+        if contamination_data.empty:
+            return "No contamination data available"
+        
+        # Calculate detailed statistics
+        overall_avg = contamination_data['obs_value'].mean()
+        by_type = contamination_data.groupby('measure_category', observed=True)['obs_value'].agg(['mean', 'count']).round(1)
+        by_water_type = contamination_data.groupby('water_type', observed=True)['obs_value'].agg(['mean', 'count']).round(1)
+        
+        # Build strings with consistent formatting
+        newline = '\n'
+        type_lines = []
+        for measure_type, stats in by_type.iterrows():
+            simplified_type = measure_type.split('for ')[-1].replace('nitrate', 'Nitrate').replace('phosphorus', 'Phosphorus').replace('pesticides', 'Pesticides')
+            type_lines.append(f"• {simplified_type}: {stats['mean']:.1f}% ({int(stats['count'])} sites)")
+        
+        water_lines = []
+        for water_type, stats in by_water_type.iterrows():
+            if water_type != 'Not applicable':
+                water_lines.append(f"• {water_type}: {stats['mean']:.1f}% ({int(stats['count'])} sites)")
+        
+        return f"""Average Contamination Rate: {overall_avg:.1f}%
 
 By Contamination Type:
 {newline.join(type_lines)}
@@ -218,61 +170,52 @@ By Water Source:
 
 Total Monitoring Sites: {len(contamination_data)}
 Countries Monitored: {contamination_data['country'].nunique()}"""
-            
-        except Exception as e:
-            return "Error loading contamination rate data"
+        
+    except Exception as e:
+        return "Error loading contamination rate data"
 
-    @app.callback(
-        Output('kpi-total-water-abstraction-card', 'title'),
-        [Input('country-dropdown', 'value'),
-         Input('year-slider', 'value'),
-         Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
-    )
-    def update_water_abstraction_hover(countries, years, water_types, contamination_types):
-        try:
-            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
-            
-            abstraction_data = filtered_df[
-                filtered_df['measure_category'] == 'Agriculture freshwater abstraction'
-            ]
-            
-            if abstraction_data.empty:
-                return "No water abstraction data available"
-            
-            # Get latest year statistics
-            latest_year = abstraction_data['year'].max()
-            latest_data = abstraction_data[abstraction_data['year'] == latest_year]
-            total_abstraction = latest_data['obs_value'].sum()
-            
-            # Get breakdown by water type and country
-            by_water_type = latest_data.groupby('water_type')['obs_value'].sum().sort_values(ascending=False)
-            top_countries = latest_data.groupby('country')['obs_value'].sum().sort_values(ascending=False).head(5)
-            
-            # Calculate trend if multiple years available
-            if len(abstraction_data['year'].unique()) > 1:
-                yearly_totals = abstraction_data.groupby('year')['obs_value'].sum()
-                if len(yearly_totals) >= 2:
-                    recent_years = yearly_totals.tail(2)
-                    change = ((recent_years.iloc[-1] - recent_years.iloc[-2]) / recent_years.iloc[-2] * 100)
-                    trend_text = f"Trend: {change:+.1f}% from previous year"
-                else:
-                    trend_text = "Trend: Insufficient data"
+def water_abstraction_hover(filtered_df):
+    try:
+        abstraction_data = filtered_df[
+            filtered_df['is_agriculture_abstraction']
+        ]
+        
+        if abstraction_data.empty:
+            return "No water abstraction data available"
+        
+        # Get latest year statistics
+        latest_year = abstraction_data['year'].max()
+        latest_data = abstraction_data[abstraction_data['year'] == latest_year]
+        total_abstraction = latest_data['obs_value'].sum()
+        
+        # Get breakdown by water type and country
+        by_water_type = latest_data.groupby('water_type', observed=True)['obs_value'].sum().sort_values(ascending=False)
+        top_countries = latest_data.groupby('country', observed=True)['obs_value'].sum().sort_values(ascending=False).head(5)
+        
+        # Calculate trend if multiple years available
+        if len(abstraction_data['year'].unique()) > 1:
+            yearly_totals = abstraction_data.groupby('year')['obs_value'].sum()
+            if len(yearly_totals) >= 2:
+                recent_years = yearly_totals.tail(2)
+                change = ((recent_years.iloc[-1] - recent_years.iloc[-2]) / recent_years.iloc[-2] * 100)
+                trend_text = f"Trend: {change:+.1f}% from previous year"
             else:
-                trend_text = "Trend: Single year data"
-            
-            # Build strings with consistent formatting
-            newline = '\n'
-            water_type_lines = []
-            for water_type, volume in by_water_type.items():
-                if water_type != 'Not applicable':
-                    water_type_lines.append(f"• {water_type}: {volume:,.0f} cubic metres")
-            
-            country_lines = []
-            for country, volume in top_countries.items():
-                country_lines.append(f"• {country}: {volume:,.0f} cubic metres")
-            
-            return f"""Total Agricultural Water Abstraction ({latest_year}): {total_abstraction:,.0f} cubic metres
+                trend_text = "Trend: Insufficient data"
+        else:
+            trend_text = "Trend: Single year data"
+        
+        # Build strings with consistent formatting
+        newline = '\n'
+        water_type_lines = []
+        for water_type, volume in by_water_type.items():
+            if water_type != 'Not applicable':
+                water_type_lines.append(f"• {water_type}: {volume:,.0f} cubic metres")
+        
+        country_lines = []
+        for country, volume in top_countries.items():
+            country_lines.append(f"• {country}: {volume:,.0f} cubic metres")
+        
+        return f"""Total Agricultural Water Abstraction ({latest_year}): {total_abstraction:,.0f} cubic metres
 
 By Water Source:
 {newline.join(water_type_lines)}
@@ -282,70 +225,61 @@ Top 5 Countries:
 
 {trend_text}
 Countries Reporting: {latest_data['country'].nunique()}"""
-            
-        except Exception as e:
-            return "Error loading water abstraction data"
+        
+    except Exception as e:
+        return "Error loading water abstraction data"
 
-    @app.callback(
-        Output('kpi-worst-contamination-type-card', 'title'),
-        [Input('country-dropdown', 'value'),
-         Input('year-slider', 'value'),
-         Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
-    )
-    def update_worst_contamination_hover(countries, years, water_types, contamination_types):
-        try:
-            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
-            
-            contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', na=False)
-            ]
-            
-            if contamination_data.empty:
-                return "No contamination data available"
-            
-            # Get contamination by type with detailed statistics
-            contamination_by_type = contamination_data.groupby('measure_category').agg({
-                'obs_value': ['mean', 'max', 'count'],
-                'country': 'nunique'
-            }).round(1)
-            
-            contamination_by_type.columns = ['avg_rate', 'max_rate', 'observations', 'countries']
-            contamination_by_type = contamination_by_type.sort_values('avg_rate', ascending=False)
-            
-            # Get the worst type
-            worst_type = contamination_by_type.index[0]
-            worst_stats = contamination_by_type.iloc[0]
-            
-            # Simplify type names
-            def simplify_name(name):
-                if 'nitrate' in name.lower():
-                    return 'Nitrate'
-                elif 'phosphorus' in name.lower():
-                    return 'Phosphorus'
-                elif 'pesticide' in name.lower():
-                    return 'Pesticides'
-                else:
-                    return 'Unknown'
-            
-            worst_simple = simplify_name(worst_type)
-            
-            # Build ranking list
-            newline = '\n'
-            ranking_lines = []
-            for i, (measure_type, stats) in enumerate(contamination_by_type.iterrows(), 1):
-                simple_name = simplify_name(measure_type)
-                ranking_lines.append(f"{i}. {simple_name}: {stats['avg_rate']:.1f}% avg ({int(stats['observations'])} sites)")
-            
-            # Get countries most affected by worst type
-            worst_type_data = contamination_data[contamination_data['measure_category'] == worst_type]
-            worst_countries = worst_type_data.groupby('country')['obs_value'].mean().sort_values(ascending=False).head(3)
-            
-            country_lines = []
-            for country, rate in worst_countries.items():
-                country_lines.append(f"• {country}: {rate:.1f}%")
-            
-            return f"""Worst Pollutant: {worst_simple} ({worst_stats['avg_rate']:.1f}% average contamination)
+def worst_contamination_hover(filtered_df):
+    try:
+        contamination_data = filtered_df[
+            filtered_df['exceeds_limits']
+        ]
+        
+        if contamination_data.empty:
+            return "No contamination data available"
+        
+        # Get contamination by type with detailed statistics
+        contamination_by_type = contamination_data.groupby('measure_category', observed=True).agg({
+            'obs_value': ['mean', 'max', 'count'],
+            'country': 'nunique'
+        }).round(1)
+        
+        contamination_by_type.columns = ['avg_rate', 'max_rate', 'observations', 'countries']
+        contamination_by_type = contamination_by_type.sort_values('avg_rate', ascending=False)
+        
+        # Get the worst type
+        worst_type = contamination_by_type.index[0]
+        worst_stats = contamination_by_type.iloc[0]
+        
+        # Simplify type names
+        def simplify_name(name):
+            if 'nitrate' in name.lower():
+                return 'Nitrate'
+            elif 'phosphorus' in name.lower():
+                return 'Phosphorus'
+            elif 'pesticide' in name.lower():
+                return 'Pesticides'
+            else:
+                return 'Unknown'
+        
+        worst_simple = simplify_name(worst_type)
+        
+        # Build ranking list
+        newline = '\n'
+        ranking_lines = []
+        for i, (measure_type, stats) in enumerate(contamination_by_type.iterrows(), 1):
+            simple_name = simplify_name(measure_type)
+            ranking_lines.append(f"{i}. {simple_name}: {stats['avg_rate']:.1f}% avg ({int(stats['observations'])} sites)")
+        
+        # Get countries most affected by worst type
+        worst_type_data = contamination_data[contamination_data['measure_category'] == worst_type]
+        worst_countries = worst_type_data.groupby('country', observed=True)['obs_value'].mean().sort_values(ascending=False).head(3)
+        
+        country_lines = []
+        for country, rate in worst_countries.items():
+            country_lines.append(f"• {country}: {rate:.1f}%")
+        
+        return f"""Worst Pollutant: {worst_simple} ({worst_stats['avg_rate']:.1f}% average contamination)
 
 Contamination Ranking:
 {newline.join(ranking_lines)}
@@ -355,9 +289,44 @@ Most Affected Countries ({worst_simple}):
 
 Max Rate Recorded: {worst_stats['max_rate']:.1f}%
 Countries Monitored: {int(worst_stats['countries'])}"""
-            
+        
+    except Exception as e:
+        return "Error loading worst contamination type data"
+
+def get_water_callbacks(dataset, app):
+    
+    @app.callback(
+        [Output('kpi-high-contamination-countries', 'children'),
+         Output('kpi-avg-contamination-rate', 'children'),
+         Output('kpi-total-water-abstraction', 'children'),
+         Output('kpi-worst-contamination-type', 'children'),
+         Output('kpi-high-contamination-countries-card', 'title'),
+         Output('kpi-avg-contamination-rate-card', 'title'),
+         Output('kpi-total-water-abstraction-card', 'title'),
+         Output('kpi-worst-contamination-type-card', 'title')],
+        [Input('country-dropdown', 'value'),
+         Input('year-slider', 'value'),
+         Input('water-type-dropdown', 'value'),
+         Input('contamination-type-dropdown', 'value')]
+    )
+    def update_kpis(countries, years, water_types, contamination_types):
+        df = dataset.frame
+        # KPI values and their hover details share one filtered frame
+        try:
+            filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
         except Exception as e:
-            return "Error loading worst contamination type data"
+            return ("0", "0%", "0", "N/A",
+                    "Error loading high-risk countries data",
+                    "Error loading contamination rate data",
+                    "Error loading water abstraction data",
+                    "Error loading worst contamination type data")
+
+        return water_kpis(filtered_df) + (
+            high_risk_countries_hover(filtered_df),
+            avg_contamination_hover(filtered_df),
+            water_abstraction_hover(filtered_df),
+            worst_contamination_hover(filtered_df),
+        )
     
     # Visualization 1: D3 data callback for high-risk countries
     @app.callback(
@@ -368,20 +337,21 @@ Countries Monitored: {int(worst_stats['countries'])}"""
          Input('contamination-type-dropdown', 'value')]
     )
     def update_high_risk_countries_d3_data_normalized(countries, years, water_types, contamination_types):
+        df = dataset.frame
         try:
             filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
             
             # Get contamination data only
             contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', case=False, na=False) |
-                filtered_df['measure_category'].str.contains('pesticides are present', case=False, na=False)
+                filtered_df['exceeds_limits'] |
+                filtered_df['pesticides_present']
             ]
             
             if contamination_data.empty:
                 return []
             
             # Calculate country-level statistics
-            country_stats = contamination_data.groupby('country').agg({
+            country_stats = contamination_data.groupby('country', observed=True).agg({
                 'obs_value': ['mean', 'count', 'max'],
                 'measure_category': lambda x: x.value_counts().index[0] if len(x) > 0 else 'Unknown'
             }).reset_index()
@@ -414,294 +384,25 @@ Countries Monitored: {int(worst_stats['countries'])}"""
             
             high_risk_countries['main_pollutant'] = high_risk_countries['main_pollutant'].apply(clean_pollutant_name)
             
-            # Convert to list of dictionaries for D3
-            d3_data = []
-            for _, row in high_risk_countries.iterrows():
-                d3_data.append({
-                    'country': str(row['country']),
-                    'contamination_rate': float(row['contamination_rate']),  # Raw for display
-                    'contamination_rate_normalized': float(row['contamination_rate_log_normalized']),  # Log normalized for sorting
-                    'monitoring_sites': int(row['monitoring_sites']),
-                    'max_contamination': float(row['max_contamination']),
-                    'main_pollutant': str(row['main_pollutant'])
-                })
-            
             # Sort by normalized contamination rate
-            d3_data = sorted(d3_data, key=lambda x: x['contamination_rate_normalized'], reverse=True)
+            high_risk_countries = high_risk_countries.sort_values(
+                'contamination_rate_log_normalized', ascending=False, kind='stable'
+            ).rename(columns={'contamination_rate_log_normalized': 'contamination_rate_normalized'})
             
-            return d3_data
+            # Column-oriented payload for D3 (raw rate for display, log normalized for sorting)
+            return columns_payload(high_risk_countries, [
+                'country', 'contamination_rate', 'contamination_rate_normalized',
+                'monitoring_sites', 'max_contamination', 'main_pollutant'
+            ])
             
         except Exception as e:
             return []
 
-    # Clean D3 visualization callback - removed all console.log statements
+    # D3 chart for the high-risk countries (assets/d3_charts.js)
     app.clientside_callback(
         f"""
         function(data) {{
-            // Function to load D3 dynamically if not available
-            function loadD3() {{
-                return new Promise((resolve, reject) => {{
-                    if (typeof d3 !== 'undefined') {{
-                        resolve();
-                        return;
-                    }}
-                    
-                    const script = document.createElement('script');
-                    script.src = 'https://cdnjs.cloudflare.com/ajax/libs/d3/7.8.5/d3.min.js';
-                    script.onload = () => resolve();
-                    script.onerror = () => reject(new Error('Failed to load D3'));
-                    document.head.appendChild(script);
-                }});
-            }}
-            
-            // Function to create the visualization
-            function createVisualization(data) {{
-                const container = d3.select('#d3-high-risk-countries');
-                if (container.empty()) {{
-                    return;
-                }}
-                
-                // Clear existing content
-                container.selectAll('*').remove();
-                
-                if (!data || data.length === 0) {{
-                    container.append('div')
-                        .style('display', 'flex')
-                        .style('justify-content', 'center')
-                        .style('align-items', 'center')
-                        .style('height', '100%')
-                        .style('color', '{TEXT_COLOR}')
-                        .style('font-size', '16px')
-                        .style('font-family', 'Inter, sans-serif')
-                        .text('No contamination data available for current filters');
-                    return;
-                }}
-                
-                // Set up dimensions
-                const margin = {{top: 50, right: 70, bottom: 120, left: 90}};
-                const containerRect = container.node().getBoundingClientRect();
-                const width = Math.max(600, containerRect.width - margin.left - margin.right);
-                const height = 350;
-                
-                // Create SVG
-                const svg = container.append('svg')
-                    .attr('width', width + margin.left + margin.right)
-                    .attr('height', height + margin.top + margin.bottom);
-                
-                const g = svg.append('g')
-                    .attr('transform', `translate(${{margin.left}},${{margin.top}})`);
-                
-                // Sort and limit data
-                const sortedData = data.sort((a, b) => b.contamination_rate - a.contamination_rate).slice(0, 20);
-                
-                // Set up scales
-                const xScale = d3.scaleBand()
-                    .domain(sortedData.map(d => d.country))
-                    .range([0, width])
-                    .padding(0.15);
-                
-                const yScale = d3.scaleLinear()
-                    .domain([0, d3.max(sortedData, d => d.contamination_rate) * 1.1])
-                    .range([height, 0]);
-                
-                // Color function
-                const getColor = (rate) => {{
-                    if (rate >= 50) return '#f94449';      // Severe - Red
-                    if (rate >= 30) return '#fdac68';      // High - Orange  
-                    if (rate >= 15) return '#fae588';      // Moderate - Yellow
-                    return '#b9ffaf';                      // Low - Green
-                }};
-                
-                // Remove any existing tooltips
-                d3.selectAll('.d3-water-tooltip').remove();
-                
-                // Create tooltip
-                const tooltip = d3.select('body')
-                    .append('div')
-                    .attr('class', 'd3-water-tooltip')
-                    .style('position', 'absolute')
-                    .style('visibility', 'hidden')
-                    .style('background-color', 'rgba(0, 0, 0, 0.9)')
-                    .style('color', 'white')
-                    .style('padding', '12px')
-                    .style('border-radius', '6px')
-                    .style('font-size', '13px')
-                    .style('font-family', 'Inter, sans-serif')
-                    .style('box-shadow', '0 4px 8px rgba(0, 0, 0, 0.3)')
-                    .style('z-index', '1000')
-                    .style('pointer-events', 'none')
-                    .style('max-width', '200px');
-                
-                // Create bars
-                const bars = g.selectAll('.bar')
-                    .data(sortedData)
-                    .enter()
-                    .append('rect')
-                    .attr('class', 'bar')
-                    .attr('x', d => xScale(d.country))
-                    .attr('width', xScale.bandwidth())
-                    .attr('y', height)
-                    .attr('height', 0)
-                    .attr('fill', d => getColor(d.contamination_rate))
-                    .attr('stroke', 'rgba(255,255,255,0.2)')
-                    .attr('stroke-width', 1)
-                    .style('cursor', 'pointer');
-                
-                // Animate bars
-                bars.transition()
-                    .duration(1000)
-                    .delay((d, i) => i * 30)
-                    .attr('y', d => yScale(d.contamination_rate))
-                    .attr('height', d => height - yScale(d.contamination_rate));
-                
-                // Add value labels
-                const labels = g.selectAll('.label')
-                    .data(sortedData)
-                    .enter()
-                    .append('text')
-                    .attr('class', 'label')
-                    .attr('x', d => xScale(d.country) + xScale.bandwidth() / 2)
-                    .attr('y', d => yScale(d.contamination_rate) - 8)
-                    .attr('text-anchor', 'middle')
-                    .style('fill', '{TEXT_COLOR}')
-                    .style('font-size', '11px')
-                    .style('font-weight', 'bold')
-                    .style('font-family', 'Inter, sans-serif')
-                    .style('opacity', 0)
-                    .text(d => d.contamination_rate.toFixed(1) + '%');
-                
-                labels.transition()
-                    .duration(1000)
-                    .delay((d, i) => i * 30 + 500)
-                    .style('opacity', 1);
-                
-                // Add interactivity
-                bars.on('mouseover', function(event, d) {{
-                    d3.select(this)
-                        .transition().duration(150)
-                        .attr('opacity', 0.8)
-                        .attr('stroke-width', 2)
-                        .attr('stroke', 'white');
-                    
-                    const riskLevel = d.contamination_rate >= 50 ? 'Severe' :
-                                    d.contamination_rate >= 30 ? 'High' :
-                                    d.contamination_rate >= 15 ? 'Moderate' : 'Low';
-                    
-                    tooltip.html(`
-                        <div style="font-weight: bold; margin-bottom: 5px;">${{d.country}}</div>
-                        <div style="color: ${{getColor(d.contamination_rate)}}; margin-bottom: 3px;">● ${{riskLevel}} Risk</div>
-                        <div><strong>${{d.contamination_rate.toFixed(1)}}%</strong> contamination rate</div>
-                        <div>${{d.monitoring_sites}} monitoring sites</div>
-                        <div>Main pollutant: ${{d.main_pollutant}}</div>
-                    `)
-                    .style('visibility', 'visible');
-                }})
-                .on('mousemove', function(event) {{
-                    tooltip
-                        .style('top', (event.pageY - 10) + 'px')
-                        .style('left', (event.pageX + 10) + 'px');
-                }})
-                .on('mouseout', function() {{
-                    d3.select(this)
-                        .transition().duration(150)
-                        .attr('opacity', 1)
-                        .attr('stroke-width', 1)
-                        .attr('stroke', 'rgba(255,255,255,0.2)');
-                    
-                    tooltip.style('visibility', 'hidden');
-                }});
-                
-                // Add axes
-                const xAxis = g.append('g')
-                    .attr('transform', `translate(0,${{height}})`)
-                    .call(d3.axisBottom(xScale));
-                
-                xAxis.selectAll('text')
-                    .style('text-anchor', 'end')
-                    .style('fill', '{TEXT_COLOR}')
-                    .style('font-family', 'Inter, sans-serif')
-                    .style('font-size', '10px')
-                    .attr('dx', '-.8em')
-                    .attr('dy', '.15em')
-                    .attr('transform', 'rotate(-45)');
-                
-                const yAxis = g.append('g')
-                    .call(d3.axisLeft(yScale).tickFormat(d => d + '%'));
-                
-                yAxis.selectAll('text')
-                    .style('fill', '{TEXT_COLOR}')
-                    .style('font-family', 'Inter, sans-serif')
-                    .style('font-size', '11px');
-                
-                // Style axes
-                g.selectAll('.domain, .tick line')
-                    .style('stroke', '{TEXT_COLOR}')
-                    .style('opacity', 0.3);
-                
-                // Add axis labels
-                g.append('text')
-                    .attr('transform', 'rotate(-90)')
-                    .attr('y', 0 - margin.left + 20)
-                    .attr('x', 0 - (height / 2))
-                    .attr('dy', '1em')
-                    .style('text-anchor', 'middle')
-                    .style('fill', '{TEXT_COLOR}')
-                    .style('font-size', '12px')
-                    .style('font-family', 'Inter, sans-serif')
-                    .text('Contamination Rate (%)');
-                
-                // Add gridlines
-                g.append('g')
-                    .attr('class', 'grid')
-                    .call(d3.axisLeft(yScale)
-                        .tickSize(-width)
-                        .tickFormat('')
-                    )
-                    .style('stroke-dasharray', '2,2')
-                    .style('opacity', 0.1);
-                
-                g.selectAll('.grid line')
-                    .style('stroke', '{TEXT_COLOR}');
-                
-                g.selectAll('.grid path')
-                    .style('stroke-width', 0);
-                
-                // Add summary stats
-                const avgRate = d3.mean(sortedData, d => d.contamination_rate);
-                const severeCount = sortedData.filter(d => d.contamination_rate >= 50).length;
-                const highCount = sortedData.filter(d => d.contamination_rate >= 30 && d.contamination_rate < 50).length;
-                
-                g.append('text')
-                    .attr('x', width)
-                    .attr('y', -15)
-                    .attr('text-anchor', 'end')
-                    .style('fill', '{TEXT_COLOR}')
-                    .style('font-size', '11px')
-                    .style('font-family', 'Inter, sans-serif')
-                    .style('font-weight', 'bold')
-                    .text(`Avg: ${{avgRate.toFixed(1)}}% | Severe: ${{severeCount}} | High: ${{highCount}}`);
-            }}
-            
-            // Main execution - silent operation
-            loadD3()
-                .then(() => createVisualization(data))
-                .catch(() => {{
-                    // Silent error handling
-                    const container = d3.select('#d3-high-risk-countries');
-                    if (!container.empty()) {{
-                        container.selectAll('*').remove();
-                        container.append('div')
-                            .style('display', 'flex')
-                            .style('justify-content', 'center')
-                            .style('align-items', 'center')
-                            .style('height', '100%')
-                            .style('color', '{TEXT_COLOR}')
-                            .style('font-size', '16px')
-                            .text('Visualization temporarily unavailable');
-                    }}
-                }});
-            
-            return data ? data.length.toString() : '0';
+            return window.dashboardCharts.waterRiskBars('d3-high-risk-countries', data, {{textColor: '{TEXT_COLOR}'}});
         }}
         """,
         Output('d3-update-trigger', 'children'),
@@ -711,13 +412,18 @@ Countries Monitored: {int(worst_stats['countries'])}"""
     
     # Visualization 2: Water Usage vs Contamination
     @app.callback(
-        Output('water-trends-dual-axis', 'figure'),
+        [Output('water-trends-dual-axis', 'figure'),
+         Output(signature_store_id('water-trends-dual-axis'), 'data')],
         [Input('country-dropdown', 'value'),
          Input('year-slider', 'value'),
          Input('water-type-dropdown', 'value'),
-         Input('contamination-type-dropdown', 'value')]
+         Input('contamination-type-dropdown', 'value')],
+        State(signature_store_id('water-trends-dual-axis'), 'data')
     )
+    @patch_figure(layout_keys=('title', 'annotations'))
+    @cached_figure(dataset, 'water-trends-dual-axis')
     def update_trends_dual_axis(countries, years, water_types, contamination_types):
+        df = dataset.frame
         try:
             filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
             
@@ -752,7 +458,7 @@ Countries Monitored: {int(worst_stats['countries'])}"""
                     )
             
             # Get abstraction data (right axis)
-            abstraction_data = filtered_df[filtered_df['measure_category'] == 'Agriculture freshwater abstraction']
+            abstraction_data = filtered_df[filtered_df['is_agriculture_abstraction']]
             if not abstraction_data.empty:
                 yearly_abstraction = abstraction_data.groupby('year')['obs_value'].sum().reset_index()
                 
@@ -817,21 +523,6 @@ Countries Monitored: {int(worst_stats['countries'])}"""
                 font=dict(color=TEXT_COLOR),
                 height=500
             )
-            
-        except Exception as e:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Error loading trends data",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, xanchor='center', yanchor='middle',
-                showarrow=False, font=dict(size=16, color=TEXT_COLOR)
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=TEXT_COLOR),
-                height=500
-            )
             return fig
     
     # Visualization 3: Water Quality vs Usage Efficiency Analysis
@@ -840,9 +531,12 @@ Countries Monitored: {int(worst_stats['countries'])}"""
     [Input('country-dropdown', 'value'),
      Input('year-slider', 'value'),
      Input('water-type-dropdown', 'value'),
-     Input('contamination-type-dropdown', 'value')]
+     Input('contamination-type-dropdown', 'value')],
+    **background_options()
     )
+    @cached_figure(dataset, 'water-quality-usage-analysis')
     def update_quality_usage_analysis_clean(countries, years, water_types, contamination_types):
+        df = dataset.frame
         try:
             filtered_df = filter_water_data(df, countries, years, water_types, contamination_types)
             
@@ -878,21 +572,21 @@ Countries Monitored: {int(worst_stats['countries'])}"""
             
             # Get contamination and abstraction data
             contamination_data = filtered_df[
-                filtered_df['measure_category'].str.contains('exceed recommended drinking water limits', na=False) |
-                filtered_df['measure_category'].str.contains('pesticides are present', na=False)
+                filtered_df['exceeds_limits'] |
+                filtered_df['pesticides_present']
             ]
             
             abstraction_data = filtered_df[
-                filtered_df['measure_category'] == 'Agriculture freshwater abstraction'
+                filtered_df['is_agriculture_abstraction']
             ]
             
             # Normalized analysis
             if not contamination_data.empty and not abstraction_data.empty:
                 # Calculate country averages
-                country_contamination = contamination_data.groupby('country')['obs_value'].mean().reset_index()
+                country_contamination = contamination_data.groupby('country', observed=True)['obs_value'].mean().reset_index()
                 country_contamination.columns = ['country', 'contamination_rate']
                 
-                country_abstraction = abstraction_data.groupby('country')['obs_value'].mean().reset_index()
+                country_abstraction = abstraction_data.groupby('country', observed=True)['obs_value'].mean().reset_index()
                 country_abstraction.columns = ['country', 'water_usage']
                 
                 # Apply logarithmic normalization
@@ -977,7 +671,7 @@ Countries Monitored: {int(worst_stats['countries'])}"""
             ]
             
             if not water_source_data.empty:
-                source_totals = water_source_data.groupby('water_type')['obs_value'].sum().reset_index()
+                source_totals = water_source_data.groupby('water_type', observed=True)['obs_value'].sum().reset_index()
                 
                 fig.add_trace(
                     go.Pie(
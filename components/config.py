@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+# Deployment switches, read from the environment once at import.
+
+
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+
+# Encode callback responses and cached figures with orjson (when installed)
+FAST_JSON = env_flag('AEID_FAST_JSON')
+
+# Callback and page responses smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = env_int('AEID_COMPRESS_MIN_BYTES', 1024)
+
+# Recompute the Nutrients KPIs and the Overview/Nutrients D3 charts in the
+# browser from a per-page extract instead of calling back to the server
+CLIENTSIDE = env_flag('AEID_CLIENTSIDE')
+
+# Seconds between checks of the dataset file for changes; 0 disables hot reload.
+# The watcher runs in the Gunicorn workers (gunicorn.conf.py) and in the
+# `python app.py` dev server, not in the process that merely imports `app`
+RELOAD_INTERVAL = env_int('AEID_RELOAD_INTERVAL', 0)
+
+# Token expected in the X-Admin-Token header of POST /admin/reload-dataset.
+# The endpoint is not registered when this is unset.
+ADMIN_TOKEN = os.environ.get('AEID_ADMIN_TOKEN') or None
+
+# Fill the layout, aggregate and figure caches at startup for the default
+# filter state and for each state listed in the AEID_WARMUP_STATES JSON file.
+# Done once in the Gunicorn master before it forks (gunicorn.conf.py) or in
+# the `python app.py` dev server, not in the process that merely imports `app`
+WARMUP = env_flag('AEID_WARMUP', True)
+WARMUP_STATES = os.environ.get('AEID_WARMUP_STATES') or None
+
+# Run the heaviest figure callbacks (see helpers/background.py) in a separate
+# process through Dash's DiskcacheManager; needs `pip install "dash[diskcache]"`
+BACKGROUND = env_flag('AEID_BACKGROUND')
+
+# Where background callback results are stored; shared by every worker on the host
+BACKGROUND_CACHE_DIR = os.environ.get('AEID_BACKGROUND_CACHE_DIR') or os.path.join(
+    tempfile.gettempdir(), 'aeid-background'
+)
@@ -1,4 +1,5 @@
 from dash import html, dcc
+from .server import asset_url
 from .styles import BACKGROUND_COLOR, TEXT_COLOR, FONT_FAMILY, VIZ_COLOR
 
 def get_header(title, bg):
@@ -9,7 +10,7 @@ def get_header(title, bg):
             'fontSize': '50px',
             'font-family': FONT_FAMILY,
             'color': TEXT_COLOR,
-            'backgroundImage': f'url("/assets/{bg}")',
+            'backgroundImage': f'url("{asset_url(bg)}")',
             'backgroundRepeat': 'no-repeat',
             'backgroundPosition': 'center',
             'backgroundSize': 'cover',
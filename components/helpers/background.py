@@ -0,0 +1,88 @@
+import functools
+import logging
+
+from dash import DiskcacheManager, Input
+
+from .. import config
+from .dataset import get_dataset_handle
+
+try:
+    import diskcache
+    import multiprocess  # noqa: F401  (DiskcacheManager forks jobs with it)
+    import psutil
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+logger = logging.getLogger(__name__)
+
+# Results stay in the disk cache this long after they were last read
+RESULT_EXPIRE_SECONDS = 60 * 60
+
+# How often the browser polls for a running job's result
+POLL_INTERVAL_MS = 250
+
+class _DiskcacheManager(DiskcacheManager):
+    def terminate_job(self, job):
+        # Dash waits up to a second for a killed job to exit. Under gunicorn
+        # the poll that collects a result often lands on a worker that did not
+        # fork the job, and a job stays a zombie until its own parent reaps it,
+        # so every such poll (and cancellation) stalled for the full second.
+        if job is None:
+            return
+        try:
+            process = psutil.Process(int(job))
+            processes = [*process.children(recursive=True), process]
+        except psutil.NoSuchProcess:
+            return
+        for proc in processes:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+
+
+def _dataset_source():
+    # The file behind the loaded frame. Unlike dataset_version() it means the
+    # same thing in every worker, which all read and write the one disk cache.
+    return get_dataset_handle().info().get('source')
+
+
+@functools.lru_cache(maxsize=None)
+def get_background_manager():
+    """
+    The DiskcacheManager shared by the background callbacks, or None when
+    AEID_BACKGROUND is off or dash[diskcache] is not installed.
+    """
+    if not config.BACKGROUND:
+        return None
+    if not HAS_DISKCACHE:
+        logger.warning("AEID_BACKGROUND is set but dash[diskcache] is not installed; running callbacks inline")
+        return None
+    return _DiskcacheManager(
+        diskcache.Cache(config.BACKGROUND_CACHE_DIR),
+        cache_by=[_dataset_source],
+        expire=RESULT_EXPIRE_SECONDS,
+    )
+
+
+def background_options():
+    """
+    Extra app.callback() arguments for a CPU-heavy figure callback. With
+    AEID_BACKGROUND on, each call runs in a process forked from the worker
+    (sharing its dataset), so the request thread returns at once and fast
+    callbacks aren't queued behind it. When the inputs change before the
+    job finishes Dash kills it and starts one for the new state; leaving
+    the page cancels it too. Finished results are kept in the disk cache,
+    keyed on the inputs and the dataset file, for every worker to reuse.
+    Empty (the callback runs inline) when the mode is off.
+    """
+    manager = get_background_manager()
+    if manager is None:
+        return {}
+    return dict(
+        background=True,
+        manager=manager,
+        interval=POLL_INTERVAL_MS,
+        cancel=[Input('url', 'pathname')],
+    )
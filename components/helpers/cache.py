@@ -0,0 +1,142 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by the number of entries
+    and, when `maxbytes` is given, by the total `sizeof()` of the values.
+    get_or_compute() lets concurrent callers asking for the same key share a
+    single computation instead of each running it.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def _lookup(self, key):
+        # Caller holds self._lock
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            self._data.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def _over_budget(self):
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            return True
+        return self.maxbytes is not None and self.nbytes > self.maxbytes
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxbytes is not None:
+                size = self.sizeof(value)
+                if size > self.maxbytes:
+                    # Would evict everything else and still not fit
+                    return
+                self.nbytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self._over_budget():
+                evicted, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted, 0)
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    # Another caller computed it while we waited
+                    self.hits += 1
+                    return value
+                self.misses += 1
+            try:
+                value = compute()
+                self.put(key, value)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'bytes': self.nbytes,
+                'maxbytes': self.maxbytes,
+            }
+
+
+# Values derived from a frame (indexes, lookups, subsets) live exactly as long
+# as the frame object they were computed from, so replacing the dataset drops
+# them along with it.
+_frame_lock = threading.Lock()
+_frame_memos = {}
+
+
+def _memo_for(df, create=False):
+    key = id(df)
+    entry = _frame_memos.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    if not create:
+        return None
+    memo = {}
+    _frame_memos[key] = (weakref.ref(df, lambda _ref: _frame_memos.pop(key, None)), memo)
+    return memo
+
+
+def memoize_on_frame(df, name, compute):
+    """Return `compute()` cached under `name` for this frame object."""
+    with _frame_lock:
+        memo = _memo_for(df, create=True)
+        if name in memo:
+            return memo[name]
+    value = compute()
+    with _frame_lock:
+        return memo.setdefault(name, value)
+
+
+def peek_frame_memo(df, name):
+    """Return the value memoized under `name` for this frame, or None."""
+    memo = _memo_for(df)
+    return None if memo is None else memo.get(name)
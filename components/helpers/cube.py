@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, memoize_on_frame
+from .filter_index import build_filter_index
+from .tools import apply_filters, get_land_log_factors
+
+# Dimensions the cube is materialized over; queries may group and filter on these
+CUBE_DIMENSIONS = [
+    'country',
+    'year',
+    'nutrients',
+    'measure_category',
+    'water_type',
+    'erosion_risk_level',
+]
+
+# Rolled-up query results kept per cube
+QUERY_CACHE_SIZE = 128
+
+
+def _key(values):
+    if values is None:
+        return None
+    if isinstance(values, (list, tuple, set)):
+        return tuple(sorted(set(values), key=str))
+    return values
+
+
+class AggregateCube:
+    """
+    Pre-aggregated `obs_value` statistics per combination of CUBE_DIMENSIONS.
+    Each cell stores sum, count, min, max and sum of squares, which is enough
+    to roll up sum/count/mean/min/max/std for any coarser group-by without
+    going back to the raw rows.
+    """
+
+    def __init__(self, df, value='obs_value'):
+        values = df[value].astype('float64')
+        frame = df[CUBE_DIMENSIONS].assign(value=values, squares=values * values)
+        self.cells = (
+            frame.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)
+            .agg(
+                sum=('value', 'sum'),
+                count=('value', 'count'),
+                min=('value', 'min'),
+                max=('value', 'max'),
+                sumsq=('squares', 'sum'),
+            )
+            .reset_index()
+        )
+        # Cells are filtered with the same indexed apply_filters() as raw rows
+        build_filter_index(self.cells)
+        self.land_factors = get_land_log_factors(df)
+        self.results = LRUCache(maxsize=QUERY_CACHE_SIZE)
+
+    def select(self, measures=None, **filters):
+        """
+        Cells matching apply_filters() keyword `filters`, optionally restricted
+        to the `measures` measure categories.
+        """
+        cells = apply_filters(self.cells, **filters)
+        if measures is not None:
+            cells = cells[cells['measure_category'].isin(measures)]
+        return cells
+
+    def query(self, by, measures=None, normalized=False, **filters):
+        """
+        Roll the cells selected by `measures`/`filters` up to the `by` dimensions.
+        Returns one row per group with sum, count, min, max, mean and std
+        (ddof=1) of `obs_value`, in the order groupby() would give them.
+        With `normalized`, values are divided by the country's agricultural land
+        factor first, as normalize_by_agricultural_land() does for raw rows.
+        Results are memoized and shared: callers must not modify them in place.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        key = (
+            tuple(by),
+            _key(measures),
+            normalized,
+            tuple(sorted((name, _key(value)) for name, value in filters.items())),
+        )
+        return self.results.get_or_compute(
+            key, lambda: self._rollup(self.select(measures, **filters), by, normalized)
+        )
+
+    def _rollup(self, cells, by, normalized):
+        stats = cells[['sum', 'min', 'max', 'sumsq']]
+        if normalized:
+            divisor = cells['country'].map(self.land_factors).astype('float64')
+            divisor = divisor.where(divisor.notna(), 1.0)
+            stats = stats.assign(
+                sum=stats['sum'] / divisor,
+                min=stats['min'] / divisor,
+                max=stats['max'] / divisor,
+                sumsq=stats['sumsq'] / (divisor * divisor),
+            )
+
+        grouped = (
+            pd.concat([cells[by], stats, cells['count']], axis=1)
+            .groupby(by, observed=True)
+            .agg(sum=('sum', 'sum'), count=('count', 'sum'), min=('min', 'min'),
+                 max=('max', 'max'), sumsq=('sumsq', 'sum'))
+        )
+
+        count = grouped['count'].to_numpy(dtype='float64')
+        total = grouped['sum'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+            variance = (grouped['sumsq'].to_numpy() - total * mean) / (count - 1)
+        # Cancellation can leave a tiny negative variance for constant groups
+        variance = np.where(count > 1, np.maximum(variance, 0.0), np.nan)
+
+        grouped['mean'] = mean
+        grouped['std'] = np.sqrt(variance)
+        return grouped.drop(columns='sumsq').reset_index()
+
+
+def get_cube(df):
+    """Return the aggregate cube for `df`, building it on first use."""
+    return memoize_on_frame(df, 'aggregate_cube', lambda: AggregateCube(df))
@@ -1,6 +1,187 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
 import pandas as pd
 
-def load_data(path="data/Dataset-Cleaned.csv"):
-    df = pd.read_csv(path)
+from .schema import apply_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather  # noqa: F401  (pandas' Feather support needs pyarrow)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = "data/Dataset-Cleaned.csv"
+
+# Bump whenever the on-disk cache layout or the dtypes it stores change,
+# so caches written by older code are rebuilt instead of reused.
+# 3: a single record batch, so columns can be mapped without concatenation
+# 4: fixed category lists for the closed code-list columns (schema.KNOWN_CATEGORIES)
+CACHE_FORMAT = 4
+
+
+def get_cache_paths(path=DATA_PATH):
+    """Return the (columnar cache, metadata) paths that sit next to the CSV."""
+    base, _ = os.path.splitext(path)
+    return f"{base}.feather", f"{base}.cache.json"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='wb'):
+    """
+    Write through a uniquely named temporary file next to `path` and move it
+    over `path` when the block completes. Every writer gets its own file, so
+    processes rebuilding the same cache at once can't interleave their
+    output, and readers (which may memory-map the result) only ever see a
+    complete file. The temporary file is removed if the block raises.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or '.', prefix=f".{os.path.basename(path)}.", suffix='.tmp'
+    )
+    try:
+        # mkstemp creates the file readable by its owner only
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, mode) as fh:
+            yield fh
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _write_meta(meta_path, meta):
+    with atomic_write(meta_path, 'w') as fh:
+        json.dump(meta, fh, indent=2)
+
+
+def _source_fingerprint(path, meta):
+    """
+    Describe the CSV by mtime, size and content hash.
+    The hash is only recomputed when mtime or size no longer match the cached
+    metadata, so an untouched file is validated with a single stat() call.
+    """
+    st = os.stat(path)
+    fingerprint = {'format': CACHE_FORMAT, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+    if meta and meta.get('format') == CACHE_FORMAT and meta.get('size') == st.st_size \
+            and meta.get('mtime_ns') == st.st_mtime_ns:
+        fingerprint['sha256'] = meta.get('sha256')
+    else:
+        fingerprint['sha256'] = file_sha256(path)
+    return fingerprint
+
+
+def _cache_is_valid(meta, fingerprint):
+    # A touched-but-identical CSV (same hash) keeps its cache
+    return bool(meta) and all(
+        meta.get(key) == fingerprint[key] for key in ('format', 'size', 'sha256')
+    )
+
+
+def read_csv(path=DATA_PATH):
+    return apply_schema(pd.read_csv(path))
+
+
+def write_cache(df, path=DATA_PATH, fingerprint=None):
+    """Write the columnar cache for `path` atomically; returns False on failure."""
+    if not HAS_PYARROW:
+        return False
+
+    cache_path, meta_path = get_cache_paths(path)
+    try:
+        fingerprint = fingerprint or _source_fingerprint(path, None)
+        # Uncompressed Feather v2 in one record batch is plain Arrow IPC that
+        # read_cache() can map column by column without copying
+        with atomic_write(cache_path) as fh:
+            df.reset_index(drop=True).to_feather(fh, compression='uncompressed', chunksize=max(len(df), 1))
+        _write_meta(meta_path, fingerprint)
+        return True
+    except Exception as e:
+        logger.warning("Could not write dataset cache %s: %s", cache_path, e)
+        return False
+
+
+def _mapped_column(column):
+    if column.num_chunks == 1 and column.null_count == 0:
+        chunk = column.chunk(0)
+        if pa.types.is_dictionary(chunk.type):
+            categories = chunk.dictionary.to_pandas()
+            codes = chunk.indices.to_numpy(zero_copy_only=True)
+            dtype = pd.CategoricalDtype(categories, ordered=chunk.type.ordered)
+            return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+        if pa.types.is_integer(chunk.type) or pa.types.is_floating(chunk.type):
+            return chunk.to_numpy(zero_copy_only=True)
+    # Nulls, several chunks or other types: convert (and copy) this column
+    return column.to_pandas()
+
+
+def read_cache(cache_path):
+    """
+    Read the columnar cache memory-mapped. Numeric columns and categorical
+    codes are read-only views of the mapped file, so every process that
+    loads the same cache (each gunicorn worker, before or after a reload)
+    shares one copy of the data through the OS page cache.
+    """
+    table = pyarrow.feather.read_table(cache_path, memory_map=True)
+    columns = {name: _mapped_column(table.column(name)) for name in table.column_names}
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_data(path=DATA_PATH, use_cache=True):
+    """
+    Load the cleaned dataset.
+    When pyarrow is available the CSV is parsed once and mirrored into a
+    Feather file next to it; loads map that file (see read_cache) as long as
+    the CSV's mtime/size/hash still match. Any cache problem falls back to
+    the CSV.
+    """
+    if not (use_cache and HAS_PYARROW):
+        return read_csv(path)
+
+    cache_path, meta_path = get_cache_paths(path)
+    meta = _read_meta(meta_path)
+    fingerprint = _source_fingerprint(path, meta)
+
+    if _cache_is_valid(meta, fingerprint) and os.path.exists(cache_path):
+        try:
+            df = read_cache(cache_path)
+            if meta.get('mtime_ns') != fingerprint['mtime_ns']:
+                try:
+                    _write_meta(meta_path, fingerprint)
+                except OSError:
+                    pass
+            return df
+        except Exception as e:
+            logger.warning("Ignoring unreadable dataset cache %s: %s", cache_path, e)
 
-    return df
\ No newline at end of file
+    df = read_csv(path)
+    if write_cache(df, path, fingerprint):
+        try:
+            return read_cache(cache_path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable dataset cache %s: %s", cache_path, e)
+    return df
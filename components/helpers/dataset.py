@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import time
+
+from .cube import get_cube
+from .data_loader import DATA_PATH, load_data
+from .filter_index import build_filter_index
+from .get_continent import add_continent_column
+from .subsets import build_subsets
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_dataset(df):
+    """Build the indexes and aggregates the callbacks rely on for `df`; returns their build times."""
+    timings = {}
+
+    start = time.perf_counter()
+    build_filter_index(df)
+    timings['index_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_cube(df)
+    timings['cube_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_subsets(df)
+    timings['subsets_seconds'] = time.perf_counter() - start
+
+    return timings
+
+
+class DatasetHandle:
+    """
+    The dataset every page and callback reads from, through `frame`.
+    `reload()` loads and prepares the new file completely before swapping it
+    in with a single assignment, so requests in flight finish on the frame
+    they started with and none sees a half-built index. Everything derived
+    from a frame (filter index, cube, subsets, page layouts, figure cache
+    keys) is memoized on that frame or keyed on its version, so it is
+    replaced along with it.
+    """
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self.version = 0
+        self.stats = {}
+        self._frame = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    @property
+    def frame(self):
+        """The current dataset, loaded on first use. Shared and read-only."""
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._load()
+        return self._frame
+
+    def _source_state(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load(self):
+        source = self._source_state()
+
+        start = time.perf_counter()
+        # Continents are derived once per country here, not per request
+        df = add_continent_column(load_data(self.path))
+        elapsed = time.perf_counter() - start
+
+        stats = dict(
+            rows=len(df),
+            columns=len(df.columns),
+            load_seconds=elapsed,
+            **prepare_dataset(df),
+            memory_bytes=int(df.memory_usage(deep=True).sum()),
+            source=source,
+        )
+
+        self._frame = df
+        self.version += 1
+        self.stats = stats
+        logger.info(
+            "Loaded dataset version %d: %d rows in %.3fs (%.1f MB)",
+            self.version, stats['rows'], elapsed, stats['memory_bytes'] / 1e6
+        )
+
+    def reload(self):
+        """Load the dataset file again and swap it in. If loading fails the current frame is kept."""
+        with self._lock:
+            self._load()
+        return self.info()
+
+    def info(self):
+        return dict(self.stats, version=self.version)
+
+    def start_watcher(self, interval):
+        """
+        Reload in a daemon thread whenever the dataset file's mtime or size
+        changes. A change is acted on once it has been stable for one poll,
+        so a file still being copied into place is not read half-written.
+        """
+        # A watcher inherited through fork() is not running in this process
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        def watch():
+            pending = None
+            while True:
+                time.sleep(interval)
+                state = self._source_state()
+                if state is None or state == self.stats.get('source'):
+                    pending = None
+                    continue
+                if state != pending:
+                    pending = state
+                    continue
+                try:
+                    self.reload()
+                except Exception:
+                    logger.exception("Reloading %s failed; keeping dataset version %d", self.path, self.version)
+                    # Don't retry the same broken file on every poll
+                    self.stats['source'] = state
+                pending = None
+
+        self._watcher = threading.Thread(target=watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+
+# Process-wide handle. Every page and callback module shares the same frame,
+# so the CSV is parsed once per worker instead of once per import.
+_handle = DatasetHandle()
+
+
+def get_dataset_handle():
+    return _handle
+
+
+def get_dataset():
+    """
+    Return the current cleaned dataset, loading it on first use.
+    The frame is shared by every caller and must be treated as read-only:
+    derive new frames from it instead of assigning into it. Code that runs
+    per request should read `get_dataset_handle().frame` at call time so it
+    picks up reloads.
+    """
+    return _handle.frame
+
+
+def get_dataset_stats():
+    """Return load time and memory figures for the shared dataset."""
+    _handle.frame
+    return _handle.info()
@@ -0,0 +1,75 @@
+import base64
+
+import numpy as np
+import pandas as pd
+
+from .cache import memoize_on_frame
+from .subsets import NUTRIENT_BALANCE_MEASURE
+from .tools import normalize_by_agricultural_land
+
+NUTRIENT_FLOW_MEASURES = ['Nutrient inputs', 'Nutrient outputs']
+
+# page -> (measure_category values shipped, columns shipped)
+PAGE_EXTRACTS = {
+    'overview': (
+        [NUTRIENT_BALANCE_MEASURE],
+        ['country', 'year', 'measure_category', 'obs_value', 'obs_value_log_normalized'],
+    ),
+    'nutrients': (
+        NUTRIENT_FLOW_MEASURES + [NUTRIENT_BALANCE_MEASURE],
+        ['country', 'year', 'nutrients', 'measure_category', 'observation_status', 'obs_value_log_normalized'],
+    ),
+}
+
+
+def typed_array(values):
+    """
+    {'dtype', 'bdata'}: the little-endian bytes of a NumPy array, base64
+    encoded, which assets/extracts.js turns into the matching JS typed array.
+    """
+    values = np.asarray(values)
+    if values.dtype == bool:
+        values = values.astype(np.uint8)
+    elif values.dtype.kind in 'iu' and values.dtype.itemsize > 4:
+        values = values.astype(np.int32)
+    elif values.dtype.kind == 'f' and values.dtype.itemsize != 8:
+        values = values.astype(np.float64)
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    return {
+        'dtype': values.dtype.name,
+        'bdata': base64.b64encode(values.tobytes()).decode('ascii'),
+    }
+
+
+def encode_column(series):
+    """
+    Numeric columns become typed arrays. String and categorical columns are
+    dictionary-encoded: a typed array of codes (-1 for missing) plus the
+    list of distinct values.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series):
+        codes, uniques = pd.factorize(series)
+        code_type = np.int8 if len(uniques) < 128 else np.int16 if len(uniques) < 32768 else np.int32
+        column = typed_array(codes.astype(code_type))
+        column['values'] = [str(value) for value in uniques]
+        return column
+    return typed_array(series.to_numpy())
+
+
+def _build_extract(df, page):
+    measures, columns = PAGE_EXTRACTS[page]
+    rows = df[df['measure_category'].isin(measures)]
+    rows = normalize_by_agricultural_land(rows, df, 'obs_value')
+    return {
+        'length': len(rows),
+        'columns': {col: encode_column(rows[col]) for col in columns},
+    }
+
+
+def get_page_extract(df, page):
+    """
+    Column-oriented extract of the rows a page's clientside callbacks work on
+    (see PAGE_EXTRACTS), ready to be placed in a dcc.Store. Built once per
+    dataset frame.
+    """
+    return memoize_on_frame(df, f'extract:{page}', lambda: _build_extract(df, page))
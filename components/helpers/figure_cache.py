@@ -0,0 +1,64 @@
+import functools
+import hashlib
+import itertools
+import json
+
+import plotly.io as pio
+
+from .cache import LRUCache, memoize_on_frame
+
+# Total size of serialized figures kept per process
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+_figures = LRUCache(maxsize=None, maxbytes=FIGURE_CACHE_BYTES)
+_versions = itertools.count(1)
+
+
+def dataset_version(df):
+    """A number identifying this dataset frame; a reloaded dataset gets a new one."""
+    return memoize_on_frame(df, 'dataset_version', lambda: next(_versions))
+
+
+def canonical_state(args):
+    """
+    Callback arguments in a form where equivalent filter states compare equal:
+    multi-select lists are de-duplicated and sorted, while numeric lists such
+    as a year range keep their order.
+    """
+    state = []
+    for value in args:
+        if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+            value = sorted(set(value))
+        state.append(value)
+    return state
+
+
+def figure_key(callback_id, args, version):
+    payload = json.dumps([callback_id, canonical_state(args), version], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached_figure(dataset, callback_id):
+    """
+    Cache a figure callback's output as serialized JSON keyed on
+    (callback id, canonical filter state, dataset version), where `dataset`
+    is the DatasetHandle the callback reads from.
+    A hit decodes the stored JSON into a plain figure dict, so no Plotly
+    objects are built; concurrent misses for one key build the figure once.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = figure_key(callback_id, args, dataset_version(dataset.frame))
+            payload = _figures.get_or_compute(key, lambda: pio.to_json(func(*args), validate=False))
+            return json.loads(payload)
+        return wrapper
+    return decorator
+
+
+def get_figure_cache_stats():
+    return _figures.stats()
+
+
+def clear_figure_cache():
+    _figures.clear()
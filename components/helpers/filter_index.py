@@ -0,0 +1,144 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, memoize_on_frame, peek_frame_memo
+
+# Filtered views kept per indexed frame
+VIEW_CACHE_SIZE = 64
+
+# Indexes of the frames still alive, for get_view_cache_stats()
+_indexes = weakref.WeakSet()
+
+# Columns apply_filters() can select on, in the order of its keyword arguments
+INDEXED_COLUMNS = [
+    'year',
+    'country',
+    'nutrients',
+    'measure_unit',
+    'measure_category',
+    'water_type',
+    'erosion_risk_level',
+    'observation_status',
+]
+
+
+class ColumnIndex:
+    """
+    Inverted index for one column.
+    `codes` holds a small integer per row (-1 for missing values) and
+    `postings[code]` the sorted row positions carrying that value.
+    """
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            self.lookup = {value: code for code, value in enumerate(series.cat.categories)}
+            codes = series.cat.codes.to_numpy()
+        else:
+            values, codes = np.unique(series.to_numpy(), return_inverse=True)
+            self.lookup = {value.item() if hasattr(value, 'item') else value: code
+                           for code, value in enumerate(values)}
+
+        self.codes = np.asarray(codes, dtype=np.int32)
+        n_codes = len(self.lookup)
+
+        # Stable sort keeps each posting list in ascending row order
+        order = np.argsort(self.codes, kind='stable').astype(np.int32)
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=n_codes)
+        start = len(self.codes) - counts.sum()  # missing values sort first
+        bounds = start + np.concatenate(([0], np.cumsum(counts)))
+        self.postings = [order[bounds[i]:bounds[i + 1]] for i in range(n_codes)]
+
+    def codes_for(self, values):
+        return [self.lookup[v] for v in values if v in self.lookup]
+
+    def codes_between(self, start, end):
+        return [code for value, code in self.lookup.items() if start <= value <= end]
+
+
+class FilterIndex:
+    """
+    Per-column inverted indexes over one frame, answering apply_filters() selections.
+    `views` memoizes the filtered frames by normalized selection, so every
+    callback reacting to the same filter change shares one computation.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.columns = {
+            col: ColumnIndex(df[col]) for col in INDEXED_COLUMNS if col in df.columns
+        }
+        self.views = LRUCache(maxsize=VIEW_CACHE_SIZE)
+        _indexes.add(self)
+
+    def normalize(self, conditions):
+        """
+        Canonical form of `conditions`: a sorted tuple of (column, codes) pairs,
+        dropping any condition that keeps every row (e.g. a year range spanning
+        all years). Equivalent selections map to the same key whatever order,
+        duplicates or unknown values they were given with.
+        """
+        kept = set()
+        for col, codes in conditions:
+            codes = tuple(sorted(set(codes)))
+            postings = self.columns[col].postings
+            if sum(len(postings[c]) for c in codes) < self.n_rows:
+                kept.add((col, codes))
+        return tuple(sorted(kept))
+
+    def select(self, conditions):
+        """
+        Return the sorted row positions matching normalized `conditions`.
+        The narrowest condition seeds the candidates from its posting lists;
+        the others are checked on those candidates only, so the work scales
+        with the selection rather than the frame.
+        """
+        if not conditions:
+            return np.arange(self.n_rows, dtype=np.int32)
+
+        def size(cond):
+            postings = self.columns[cond[0]].postings
+            return sum(len(postings[c]) for c in cond[1])
+
+        ordered = sorted(conditions, key=size)
+
+        col, codes = ordered[0]
+        postings = self.columns[col].postings
+        if not codes:
+            return np.empty(0, dtype=np.int32)
+        if len(codes) == 1:
+            positions = postings[codes[0]]
+        else:
+            positions = np.sort(np.concatenate([postings[c] for c in codes]))
+
+        for col, codes in ordered[1:]:
+            if not len(positions):
+                break
+            column = self.columns[col]
+            allowed = np.zeros(len(column.postings) + 1, dtype=bool)
+            allowed[list(codes)] = True  # code -1 (missing) maps to the trailing False
+            positions = positions[allowed[column.codes[positions]]]
+
+        return positions
+
+
+def build_filter_index(df):
+    """Build (once) the filter index for `df`; apply_filters() uses it from then on."""
+    return memoize_on_frame(df, 'filter_index', lambda: FilterIndex(df))
+
+
+def get_filter_index(df):
+    """Return the index built for exactly this frame object, or None."""
+    return peek_frame_memo(df, 'filter_index')
+
+
+def get_view_cache_stats():
+    """Filtered-view cache hits, misses and stored views, summed over every indexed frame still alive."""
+    totals = {'indexes': 0, 'hits': 0, 'misses': 0, 'size': 0}
+    for index in list(_indexes):
+        stats = index.views.stats()
+        totals['indexes'] += 1
+        for key in ('hits', 'misses', 'size'):
+            totals[key] += stats[key]
+    return totals
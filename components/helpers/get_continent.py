@@ -1,17 +1,56 @@
+from functools import lru_cache
+
+import pandas as pd
 import pycountry_convert as pc
 
+CONTINENT_NAMES = {
+    'AF': 'Africa',
+    'AS': 'Asia',
+    'EU': 'Europe',
+    'NA': 'North America',
+    'OC': 'Oceania',
+    'SA': 'South America'
+}
+
+# Names pycountry_convert does not resolve (or that should not be resolved),
+# checked before the lookup
+CONTINENT_OVERRIDES = {
+    'Korea': 'Asia',
+    'North Korea': 'Asia',
+    'Turkey': 'Asia',
+    'Türkiye': 'Asia',
+    'Kosovo': 'Europe',
+    # Aggregates are not countries
+    'World': 'Other',
+    'OECD': 'Other',
+    'OECD Asia Oceania': 'Other',
+    'OECD America': 'Other',
+    'OECD Europe': 'Other',
+    'EU': 'Other',
+    'European Union': 'Other',
+}
+
+@lru_cache(maxsize=None)
 def get_continent(country_name):
+    if country_name in CONTINENT_OVERRIDES:
+        return CONTINENT_OVERRIDES[country_name]
     try:
         code = pc.country_name_to_country_alpha2(country_name)
         continent_code = pc.country_alpha2_to_continent_code(code)
-        continent_name = {
-            'AF': 'Africa',
-            'AS': 'Asia',
-            'EU': 'Europe',
-            'NA': 'North America',
-            'OC': 'Oceania',
-            'SA': 'South America'
-        }.get(continent_code, 'Other')
-        return continent_name
-    except:
-        return 'Other'
\ No newline at end of file
+        return CONTINENT_NAMES.get(continent_code, 'Other')
+    except Exception:
+        return 'Other'
+
+def continent_series(countries):
+    """
+    Categorical continent for each value of `countries`.
+    get_continent() runs once per distinct country, not once per row.
+    """
+    countries = countries.astype('category')
+    lookup = {country: get_continent(str(country)) for country in countries.cat.categories}
+    continents = countries.map(lookup).astype(object)
+    return continents.astype(pd.CategoricalDtype(sorted(set(lookup.values()))))
+
+def add_continent_column(df):
+    """Return `df` with a categorical 'continent' column derived from 'country'."""
+    return df.assign(continent=continent_series(df['country']))
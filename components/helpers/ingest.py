@@ -0,0 +1,189 @@
+"""
+Ingestion pipeline: raw OECD "Agri-environmental indicators" CSV -> Dataset-Cleaned.csv.
+
+    python -m components.helpers.ingest "OECD.TAD.ARP,DSD_AGRI_ENV@DF_AEI,1.0+.A......csv"
+    python -m components.helpers.ingest raw.csv --output data/Dataset-Cleaned.csv --chunksize 500000
+
+Performs the cleaning steps of data/data_cleaning.ipynb on the raw file in
+chunks, so memory is bounded by the cleaned (categorical) rows rather than
+the 30-column raw extract. The same pass writes the cleaned CSV and the
+columnar Feather cache that load_data() reads, so the app's first start
+after a refresh does not parse the CSV again.
+"""
+import argparse
+import datetime
+import hashlib
+import logging
+import os
+import time
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .data_loader import CACHE_FORMAT, DATA_PATH, atomic_write, write_cache
+from .schema import apply_schema
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cleaning rules below change; recorded in the cache metadata
+INGEST_VERSION = 1
+
+CHUNK_SIZE = 200_000
+
+RELEVANT_COLUMNS = [
+    "REF_AREA", "Reference area", "TIME_PERIOD",
+    "OBS_VALUE", "MEASURE", "Measure",
+    "Erosion risk level", "Water type", "Nutrients",
+    "Unit of measure", "Observation status", "OBS_STATUS", "Unit multiplier"
+]
+
+RENAME_MAP = {
+    'REF_AREA': 'country_code',
+    'Reference area': 'country',
+    'Observation status': 'observation_status',
+    'OBS_STATUS': 'obs_status',
+    'MEASURE': 'measure_code',
+    'Measure': 'measure_category',
+    'Unit of measure': 'measure_unit',
+    'Erosion risk level': 'erosion_risk_level',
+    'Water type': 'water_type',
+    'Nutrients': 'nutrients',
+    'TIME_PERIOD': 'year',
+    'OBS_VALUE': 'obs_value',
+    'Unit multiplier': 'unit_multiplier',
+}
+
+# Corrupted or long country names -> the names used across the dashboard
+COUNTRY_REPLACEMENTS = {
+    "China (People’s Republic of)": "China",
+    "China (Peopleâ€™s Republic of)": "China",
+    "Macau (China)": "Macau",
+    "Hong Kong (China)": "Hong Kong",
+    "Democratic Peopleâ€™s Republic of Korea": "North Korea",
+    "TÃ¼rkiye": "Turkey",
+    "CÃ´te dâ€™Ivoire": "Côte d'Ivoire",
+    "RÃ©union": "Reunion",
+    "European Union (27 countries)": "EU",
+    "European Union (28 countries)": "EU",
+    "Euro area (19 countries)": "EU",
+    "European Union (27 countries from 01/02/2020)": "EU",
+    "European Union": "EU",
+}
+
+
+def clean_countries(names):
+    """Strip and replace country names (see COUNTRY_REPLACEMENTS) for a whole column at once."""
+    return names.str.strip().replace(COUNTRY_REPLACEMENTS)
+
+
+def clean_chunk(chunk):
+    """Apply the cleaning steps to one chunk of the raw CSV (read as strings)."""
+    chunk = chunk[RELEVANT_COLUMNS].rename(columns=RENAME_MAP)
+
+    chunk['year'] = pd.to_numeric(chunk['year'], errors='coerce')
+    chunk['obs_value'] = pd.to_numeric(chunk['obs_value'], errors='coerce').astype('float64')
+    chunk = chunk.dropna(subset=['obs_value', 'year'])
+    chunk['year'] = chunk['year'].astype('int64')
+
+    chunk['country'] = clean_countries(chunk['country'])
+    return chunk
+
+
+def _compact(chunk):
+    # Kept in memory until the end of the pass, so store strings as categoricals
+    return chunk.astype({col: 'category' for col in chunk.columns if col not in ('year', 'obs_value')})
+
+
+def _concat(chunks, columns):
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    frame = {}
+    for col in columns:
+        parts = [chunk[col] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            frame[col] = union_categoricals(parts, ignore_order=True)
+        else:
+            frame[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(frame)
+
+
+def ingest(raw_path, output_path=DATA_PATH, chunksize=CHUNK_SIZE, encoding='utf-8', write_columnar_cache=True):
+    """
+    Clean `raw_path` into `output_path` and, unless disabled, write the
+    columnar cache for it. Both files are replaced atomically. Returns a
+    summary dict (rows read/written, timings).
+    """
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    raw_rows = 0
+    rows = 0
+    chunks = []
+
+    reader = pd.read_csv(raw_path, usecols=RELEVANT_COLUMNS, dtype=str, encoding=encoding, chunksize=chunksize)
+    with atomic_write(output_path) as fh:
+        for i, chunk in enumerate(reader):
+            raw_rows += len(chunk)
+            cleaned = clean_chunk(chunk)
+            rows += len(cleaned)
+
+            data = cleaned.to_csv(index=False, header=(i == 0)).encode('utf-8')
+            fh.write(data)
+            digest.update(data)
+
+            if write_columnar_cache:
+                chunks.append(_compact(cleaned))
+            logger.info("Ingested %d raw rows", raw_rows)
+
+        if raw_rows == 0:
+            data = ','.join(RENAME_MAP[col] for col in RELEVANT_COLUMNS).encode('utf-8') + b'\n'
+            fh.write(data)
+            digest.update(data)
+    csv_seconds = time.perf_counter() - start
+
+    summary = {
+        'version': INGEST_VERSION,
+        'source': os.path.basename(raw_path),
+        'raw_rows': raw_rows,
+        'rows': rows,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'csv_seconds': round(csv_seconds, 3),
+        'cache_written': False,
+    }
+
+    if write_columnar_cache:
+        cache_start = time.perf_counter()
+        df = apply_schema(_concat(chunks, [RENAME_MAP[col] for col in RELEVANT_COLUMNS]))
+        del chunks
+
+        st = os.stat(output_path)
+        fingerprint = {
+            'format': CACHE_FORMAT,
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha256': digest.hexdigest(),
+            'ingest': {key: summary[key] for key in ('version', 'source', 'raw_rows', 'rows', 'created')},
+        }
+        summary['cache_written'] = write_cache(df, output_path, fingerprint)
+        summary['cache_seconds'] = round(time.perf_counter() - cache_start, 3)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('raw_path', help='raw CSV downloaded from the OECD Data Explorer')
+    parser.add_argument('--output', default=DATA_PATH, help='cleaned CSV to write')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help='raw rows per chunk')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--no-cache', action='store_true', help='only write the CSV, not the columnar cache')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    summary = ingest(args.raw_path, args.output, chunksize=args.chunksize, encoding=args.encoding,
+                     write_columnar_cache=not args.no_cache)
+    for key, value in summary.items():
+        print(f"{key:<14}{value}")
+
+
+if __name__ == '__main__':
+    main()
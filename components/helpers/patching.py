@@ -0,0 +1,76 @@
+import functools
+import hashlib
+import json
+
+from dash import Patch, dcc, no_update
+
+# Per-trace arrays that change with the filters; everything else in a trace
+# (type, name, styling, axis) is part of the figure's structure
+DATA_KEYS = ('x', 'y', 'z', 'text', 'customdata', 'hovertext')
+
+
+def signature_store_id(graph_id):
+    return f'{graph_id}-signature'
+
+
+def signature_store(graph_id):
+    """The dcc.Store a patch_figure callback keeps its graph's signature in; place it next to the graph."""
+    return dcc.Store(id=signature_store_id(graph_id))
+
+
+def figure_signature(figure, layout_keys):
+    """
+    Hash of everything in `figure` a Patch doesn't send: the traces without
+    their DATA_KEYS arrays and the layout without `layout_keys`. Which of
+    those keys are present is part of the structure, so a Patch only ever
+    assigns keys the current figure already has.
+    """
+    layout = figure.get('layout', {})
+    structure = {key: value for key, value in layout.items() if key not in layout_keys}
+    structure['_patched'] = sorted(key for key in layout_keys if key in layout)
+    traces = [
+        dict({key: value for key, value in trace.items() if key not in DATA_KEYS},
+             _patched=[key for key in DATA_KEYS if key in trace])
+        for trace in figure.get('data', [])
+    ]
+    payload = json.dumps([traces, structure], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def patch_figure(layout_keys=('title',)):
+    """
+    Answer a filter change with a dash.Patch that replaces only the trace
+    arrays (DATA_KEYS) and the listed layout keys, leaving the traces'
+    styling and the rest of the layout in the browser untouched.
+    The callback has two outputs, the graph's figure and its signature store
+    (see signature_store), and takes that store's data as its last argument
+    (a State). A full figure and its new signature are sent whenever the
+    stored signature differs: on the first render of the page, or when the
+    new figure has other traces or another layout, such as an error figure.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            *args, current_signature = args
+            figure = func(*args)
+            if figure is None:
+                return figure, None
+
+            if hasattr(figure, 'to_plotly_json'):
+                figure = figure.to_plotly_json()
+            signature = figure_signature(figure, layout_keys)
+            if signature != current_signature:
+                return figure, signature
+
+            patch = Patch()
+            for i, trace in enumerate(figure.get('data', [])):
+                for key in DATA_KEYS:
+                    if key in trace:
+                        patch['data'][i][key] = trace[key]
+            layout = figure.get('layout', {})
+            for key in layout_keys:
+                if key in layout:
+                    patch['layout'][key] = layout[key]
+            return patch, no_update
+        return wrapper
+    return decorator
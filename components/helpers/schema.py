@@ -0,0 +1,71 @@
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Explicit dtypes for Dataset-Cleaned.csv. String dimensions become
+# categoricals so filters compare integer codes instead of Python strings.
+
+NUMERIC_DTYPES = {
+    'year': 'int16',
+    # float64 keeps every KPI and chart value identical to the CSV parse
+    'obs_value': 'float64',
+}
+
+# Categories are stored in sorted order, which keeps group-by output in the
+# same alphabetical order the plain string columns produced.
+CATEGORICAL_COLUMNS = [
+    'country_code',
+    'country',
+    'measure_code',
+    'measure_category',
+    'measure_unit',
+    'nutrients',
+    'water_type',
+    'erosion_risk_level',
+    'observation_status',
+    'obs_status',
+    'unit_multiplier',
+]
+
+# Closed OECD code lists. Their categories are fixed here rather than taken
+# from the file, so a value has the same category code in every dataset
+# version (and in the caches and indexes built from it). The remaining
+# columns (countries, measures, units) are open-ended and keep the sorted
+# values found in the data.
+KNOWN_CATEGORIES = {
+    'nutrients': ['Nitrogen', 'Not applicable', 'Phosphorus'],
+    'water_type': ['Coastal water', 'Ground water', 'Not applicable', 'Surface water', 'Total'],
+    'erosion_risk_level': ['High', 'Low', 'Moderate', 'Not applicable', 'Severe', 'Tolerable', 'Total'],
+    'observation_status': ['Estimated value', 'Normal value', 'Provisional value', 'Time series break'],
+    'obs_status': ['A', 'B', 'E', 'P'],
+    'unit_multiplier': ['Millions', 'Thousands', 'Units'],
+}
+
+
+def _categories(col, values):
+    present = sorted(values.dropna().unique(), key=str)
+    known = KNOWN_CATEGORIES.get(col)
+    if known is None:
+        return present
+    # Values outside the code list go after it, so known codes don't shift
+    unknown = [value for value in present if value not in known]
+    if unknown:
+        logger.warning("Unexpected %s values %s; add them to KNOWN_CATEGORIES", col, unknown)
+    return known + unknown
+
+
+def apply_schema(df):
+    """Return a copy of `df` cast to the compact dataset dtypes."""
+    df = df.copy()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.Categorical(df[col], categories=_categories(col, df[col]))
+
+    for col, dtype in NUMERIC_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+
+    return df
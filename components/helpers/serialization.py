@@ -0,0 +1,42 @@
+import logging
+
+import pandas as pd
+import plotly.io as pio
+
+try:
+    import orjson  # noqa: F401  (plotly's 'orjson' JSON engine needs it)
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+
+def enable_fast_json():
+    """
+    Make plotly's JSON encoding, which Dash uses for every callback response
+    and figure_cache uses for stored figures, go through orjson. NumPy arrays
+    are then written straight from their buffers instead of via tolist().
+    Returns False (and keeps the default encoder) when orjson is missing.
+    """
+    if not HAS_ORJSON:
+        logger.warning("AEID_FAST_JSON is set but orjson is not installed; using the default JSON encoder")
+        return False
+    pio.json.config.default_engine = 'orjson'
+    return True
+
+
+def columns_payload(frame, columns=None):
+    """
+    Column-oriented dcc.Store payload, {column: values}, for the D3 charts.
+    Numeric columns stay NumPy arrays for the JSON engine to encode directly;
+    assets/payloads.js turns the payload back into row objects.
+    """
+    payload = {}
+    for col in columns or frame.columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object:
+            payload[col] = values.astype(str).tolist()
+        else:
+            payload[col] = values.to_numpy()
+    return payload
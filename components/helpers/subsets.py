@@ -0,0 +1,108 @@
+import re
+
+import numpy as np
+
+from .cache import memoize_on_frame
+from .filter_index import build_filter_index
+
+WATER_QUALITY_MEASURES = [
+    'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for nitrate',
+    'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for phosphorus',
+    'Share of monitoring sites in agricultural areas that exceed recommended drinking water limits for pesticides',
+    'Share of monitoring sites in agricultural areas where one or more pesticides are present',
+]
+
+WATER_ABSTRACTION_MEASURES = [
+    'Agriculture freshwater abstraction',
+    'Total freshwater abstraction',
+]
+
+MANURE_MEASURES = [
+    'Manure management',
+    'Manure imports',
+    'Manure withdrawals',
+    'Net input of manure',
+    'Livestock manure production',
+    'Organic fertilisers (excluding livestock manure)',
+]
+
+NUTRIENT_BALANCE_MEASURE = 'Balance (inputs minus outputs)'
+
+# Boolean columns derived from measure_category. Each test runs once per
+# category rather than once per row.
+MEASURE_FLAGS = {
+    'is_erosion': lambda m: 'erosion' in m.lower(),
+    'exceeds_limits': lambda m: 'exceed recommended drinking water limits' in m.lower(),
+    'pesticides_present': lambda m: 'pesticides are present' in m.lower(),
+    'is_abstraction': lambda m: 'abstraction' in m,
+    'is_agriculture_abstraction': lambda m: m == 'Agriculture freshwater abstraction',
+    'is_manure_related': lambda m: re.search('manure|livestock', m, re.IGNORECASE) is not None,
+}
+
+# name -> (measure_category predicate, flag columns carried by the subset)
+DOMAIN_SUBSETS = {
+    'erosion': (
+        MEASURE_FLAGS['is_erosion'],
+        [],
+    ),
+    'water_quality': (
+        lambda m: m in WATER_QUALITY_MEASURES,
+        ['exceeds_limits', 'pesticides_present'],
+    ),
+    'water_abstraction': (
+        lambda m: m in WATER_ABSTRACTION_MEASURES,
+        ['is_abstraction', 'is_agriculture_abstraction'],
+    ),
+    'water': (
+        lambda m: m in WATER_QUALITY_MEASURES or m in WATER_ABSTRACTION_MEASURES,
+        ['exceeds_limits', 'pesticides_present', 'is_abstraction', 'is_agriculture_abstraction'],
+    ),
+    'manure': (
+        lambda m: m in MANURE_MEASURES,
+        ['is_manure_related'],
+    ),
+    'nutrient_balance': (
+        lambda m: m == NUTRIENT_BALANCE_MEASURE,
+        [],
+    ),
+}
+
+
+def _row_flags(series, predicate):
+    # Missing values (code -1) index the trailing False
+    series = series.astype('category')
+    per_category = [bool(predicate(str(value))) for value in series.cat.categories]
+    table = np.array(per_category + [False], dtype=bool)
+    return table[series.cat.codes.to_numpy()]
+
+
+def measures_where(df, flag):
+    """measure_category values of `df` for which MEASURE_FLAGS[`flag`] holds."""
+    def compute():
+        categories = df['measure_category'].astype('category').cat.categories
+        return [m for m in categories if MEASURE_FLAGS[flag](str(m))]
+    return memoize_on_frame(df, f'measures:{flag}', compute)
+
+
+def _build_subset(df, name):
+    predicate, flags = DOMAIN_SUBSETS[name]
+    subset = df.take(np.flatnonzero(_row_flags(df['measure_category'], predicate)))
+    subset = subset.assign(**{
+        flag: _row_flags(subset['measure_category'], MEASURE_FLAGS[flag]) for flag in flags
+    })
+    # Filtering a subset goes through its own index, like the full frame
+    build_filter_index(subset)
+    return subset
+
+
+def get_subset(df, name):
+    """
+    Rows of `df` belonging to the named domain (see DOMAIN_SUBSETS), in their
+    original order, with that domain's flag columns added. Built once per
+    dataset frame and shared: callers must not modify it in place.
+    """
+    return memoize_on_frame(df, f'subset:{name}', lambda: _build_subset(df, name))
+
+
+def build_subsets(df):
+    return {name: get_subset(df, name) for name in DOMAIN_SUBSETS}
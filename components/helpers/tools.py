@@ -1,5 +1,11 @@
 import textwrap
 
+import numpy as np
+import pandas as pd
+
+from .cache import memoize_on_frame
+from .filter_index import get_filter_index
+
 AGGREGATE_REGIONS = ['World', 'OECD', 'OECD Asia Oceania', 'OECD America', 'OECD Europe']
 AGGREGATE_REGIONS_ALT = AGGREGATE_REGIONS + ['EU']
 
@@ -19,46 +25,49 @@ def apply_filters(
     Apply optional multi-select filters. Each selection list may contain 'All'.
     Only filters provided (not None) are applied.
     year_range is a tuple or list [start, end].
+    Frames registered with build_filter_index() are answered from their index
+    without scanning or copying the whole frame, and the result is memoized:
+    callers share it and must not modify it in place.
     """
-    d = df.copy()
+    selections = {
+        'year': selected_years,
+        'country': selected_countries,
+        'nutrients': selected_nutrients,
+        'measure_unit': selected_units,
+        'measure_category': selected_categories,
+        'water_type': selected_water_types,
+        'erosion_risk_level': selected_erosion_levels,
+        'observation_status': selected_status,
+    }
+    # 'All' (or an empty selection) means no filter on that column
+    active = {col: values for col, values in selections.items() if values and 'All' not in values}
+
+    index = get_filter_index(df)
+    if index is not None:
+        conditions = []
+        if year_range:
+            start, end = year_range
+            conditions.append(('year', index.columns['year'].codes_between(start, end)))
+        for col, values in active.items():
+            conditions.append((col, index.columns[col].codes_for(values)))
+
+        key = index.normalize(conditions)
+        if not key:
+            return df.copy(deep=False)
+        return index.views.get_or_compute(key, lambda: df.take(index.select(key)))
+
+    mask = np.ones(len(df), dtype=bool)
 
     # Year filter
     if year_range:
         start, end = year_range
-        d = d[(d['year'] >= start) & (d['year'] <= end)]
-
-    # Country filter
-    if selected_years and 'All' not in selected_years:
-        d = d[d['year'].isin(selected_years)]
-
-    # Country filter
-    if selected_countries and 'All' not in selected_countries:
-        d = d[d['country'].isin(selected_countries)]
-
-    # Nutrient filter
-    if selected_nutrients and 'All' not in selected_nutrients:
-        d = d[d['nutrients'].isin(selected_nutrients)]
-
-    # Unit filter
-    if selected_units and 'All' not in selected_units:
-        d = d[d['measure_unit'].isin(selected_units)]
-
-    # Measure category filter
-    if selected_categories and 'All' not in selected_categories:
-        d = d[d['measure_category'].isin(selected_categories)]
+        mask &= ((df['year'] >= start) & (df['year'] <= end)).to_numpy()
 
-    # Water type filter
-    if selected_water_types and 'All' not in selected_water_types:
-        d = d[d['water_type'].isin(selected_water_types)]
+    # Multi-select filters
+    for col, values in active.items():
+        mask &= df[col].isin(values).to_numpy()
 
-    # Erosion risk level filter
-    if selected_erosion_levels and 'All' not in selected_erosion_levels:
-        d = d[d['erosion_risk_level'].isin(selected_erosion_levels)]
-
-    if selected_status and 'All' not in selected_status:
-        d= d[d['observation_status'].isin(selected_status)]
-
-    return d
+    return df[mask]
 
 def remove_aggregates(df, map_view=False):
     df = df[~df.country.isin(AGGREGATE_REGIONS)]
@@ -66,31 +75,51 @@ def remove_aggregates(df, map_view=False):
         df = df[~df.country.isin(AGGREGATE_REGIONS_ALT)]
     return df
 
+def count_values(series):
+    """value_counts() without the zero-count rows categorical columns report for unused categories."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
 def style_title(raw_title):
     return "<br>".join(textwrap.wrap(raw_title, width=85))
 
 
 """
 Extract agricultural land area data from the dataset
-Returns a dictionary mapping country to agricultural land area in thousands of hectares
+Returns a Series mapping country to agricultural land area in thousands of hectares
 """
-def get_agricultural_land_area_from_dataset(df):
+def _agricultural_land_areas(df):
     # Filter for agricultural land area data
-    land_data = df[df['measure_category'] == 'Total agricultural land area'].copy()
-    
+    land_data = df[df['measure_category'] == 'Total agricultural land area']
+
     if land_data.empty:
-        return {}
-    
+        return pd.Series(dtype='float64')
+
     # Get the latest year's data for each country
     latest_year = land_data['year'].max()
     latest_land_data = land_data[land_data['year'] == latest_year]
-    
-    # Create mapping - values are already in thousands of hectares
-    country_land_mapping = {}
-    for _, row in latest_land_data.iterrows():
-        country_land_mapping[row['country']] = row['obs_value']
-    
-    return country_land_mapping
+
+    # Values are already in thousands of hectares; the last row wins on duplicates
+    areas = pd.Series(
+        latest_land_data['obs_value'].to_numpy(),
+        index=pd.Index(latest_land_data['country'].astype(object), name='country'),
+    )
+    return areas[~areas.index.duplicated(keep='last')]
+
+
+def get_agricultural_land_area_from_dataset(df):
+    return _agricultural_land_areas(df).to_dict()
+
+
+"""
+Per-country divisor used by normalize_by_agricultural_land: log10(area + 1).
+Computed once per dataset frame and reused by every callback.
+"""
+def get_land_log_factors(source_df):
+    return memoize_on_frame(
+        source_df, 'land_log_factors',
+        lambda: np.log10(_agricultural_land_areas(source_df) + 1)
+    )
 
 
 """
@@ -105,28 +134,15 @@ Returns:
     DataFrame with normalized column added
 """
 def normalize_by_agricultural_land(df, source_df, value_column='obs_value'):
- 
-    import numpy as np
-    
-    # Get agricultural land area mapping from dataset
-    land_mapping = get_agricultural_land_area_from_dataset(source_df)
-    
+    factors = get_land_log_factors(source_df)
+
     normalized_df = df.copy()
     new_column = f"{value_column}_log_normalized"
-    
-    # Initialize normalized column with original values
-    normalized_df[new_column] = normalized_df[value_column]
-    
-    for country in df['country'].unique():
-        if country in land_mapping:
-            mask = df['country'] == country
-            ag_land_1000ha = land_mapping[country]
-            
-            # Logarithmic normalization: contamination / log10(area + 1)
-            # Adding 1 to prevent log(0) issues
-            normalized_df.loc[mask, new_column] = (
-                df.loc[mask, value_column] / np.log10(ag_land_1000ha + 1)
-            )
-    
-    return normalized_df
 
+    # Logarithmic normalization: contamination / log10(area + 1).
+    # Countries without land area data keep their original value.
+    divisor = df['country'].map(factors).astype('float64')
+    values = df[value_column]
+    normalized_df[new_column] = (values / divisor).where(divisor.notna(), values)
+
+    return normalized_df
@@ -0,0 +1,99 @@
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PAGES = ['/', '/n', '/m', '/e', '/w']
+
+
+def _components(node):
+    # Every component in a serialized layout, depth first
+    if isinstance(node, list):
+        for child in node:
+            yield from _components(child)
+    elif isinstance(node, dict) and 'props' in node:
+        yield node
+        for value in node['props'].values():
+            yield from _components(value)
+
+
+def layout_defaults(app):
+    """
+    {component id: default value} for every component with a `value` across
+    the pages. display_page returns layouts as decoded JSON, so the values
+    are the plain numbers and strings the browser sends back and produce the
+    same cache keys.
+    """
+    display_page = app.callback_map['page-content.children']['callback'].__wrapped__
+    defaults = {'url': PAGES[0]}
+    for path in PAGES:
+        for component in _components(display_page(path)):
+            props = component['props']
+            if props.get('id') and props.get('value') is not None:
+                defaults.setdefault(props['id'], props['value'])
+    return defaults
+
+
+def server_callbacks(app):
+    """(output key, display name, undecorated-by-Dash function, dependencies) per server callback."""
+    for key, spec in app.callback_map.items():
+        func = spec.get('callback')
+        if func is None:  # clientside
+            continue
+        func = getattr(func, '__wrapped__', func)
+        page = func.__module__.rsplit('.', 1)[-1].replace('_callbacks', '')
+        yield key, f"{page}.{func.__name__}", func, spec['inputs'] + spec.get('state', [])
+
+
+def load_states(path):
+    """Read a JSON list of filter states, each {component id: value}, e.g. [{"country-dropdown": ["France"]}]."""
+    with open(path) as fh:
+        states = json.load(fh)
+    if not isinstance(states, list) or not all(isinstance(state, dict) for state in states):
+        raise ValueError(f"{path} must hold a JSON list of {{component id: value}} objects")
+    return states
+
+
+def warm_up(app, states=()):
+    """
+    Build every page layout and call every server callback for the default
+    filter state, then for each of `states` (layout defaults fill the inputs
+    a state doesn't set). This fills the same filter, aggregate, layout and
+    figure caches real requests use. Returns the number of callback calls made.
+    """
+    start = time.perf_counter()
+    defaults = layout_defaults(app)
+    calls = 0
+    for state in [{}, *states]:
+        for _, name, func, deps in server_callbacks(app):
+            args = [state.get(dep['id'], defaults.get(dep['id'])) for dep in deps]
+            try:
+                func(*args)
+                calls += 1
+            except Exception as e:
+                logger.debug("Warm-up call to %s failed: %s", name, e)
+    logger.info("Warmed caches with %d callback calls over %d filter states in %.2fs",
+                calls, 1 + len(states), time.perf_counter() - start)
+    return calls
+
+
+def run_warmup(app, states_path=None):
+    """warm_up() with the states read from `states_path`, logging rather than raising on failure."""
+    try:
+        states = load_states(states_path) if states_path else []
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring warm-up states file %s: %s", states_path, e)
+        states = []
+    try:
+        warm_up(app, states)
+    except Exception:
+        logger.exception("Cache warm-up failed")
+
+
+def start_warmup(app, states_path=None):
+    """Run run_warmup() in a daemon thread, so the app serves requests while it runs."""
+    thread = threading.Thread(target=run_warmup, args=(app, states_path), name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
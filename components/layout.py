@@ -1,16 +1,18 @@
 from dash import html, dcc
 from .styles import BACKGROUND_COLOR, TEXT_COLOR, FONT_FAMILY, VIZ_COLOR
-from .helpers.data_loader import load_data
 from .sidebar import get_sidebar
 from .header import get_header
-
-df = load_data()
+from .helpers.extracts import PAGE_EXTRACTS
 
 layout = html.Div([
     dcc.Location(id='url', refresh=False),
 
+    # Rows for the clientside callbacks (AEID_CLIENTSIDE). They live in the
+    # shell, not the pages, so each is sent once per dataset version
+    *[dcc.Store(id=f'{page}-extract') for page in PAGE_EXTRACTS],
+
     # Header stays at the top
-    get_header("Agri-environmental Indicators Dashboard", "bg2.gif"),
+    get_header("Agri-environmental Indicators Dashboard", "bg.gif"),
 
     # THIS is the flex container that lives below the header
     # with the sidebar and the content
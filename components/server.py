@@ -0,0 +1,148 @@
+import hmac
+import logging
+import os
+from functools import lru_cache
+
+from flask import abort, jsonify, request
+
+from . import config
+from .helpers.data_loader import file_sha256
+from .helpers.dataset import get_dataset_handle, get_dataset_stats
+from .helpers.figure_cache import get_figure_cache_stats
+from .helpers.filter_index import get_view_cache_stats
+
+try:
+    from flask_compress import Compress
+    HAS_FLASK_COMPRESS = True
+except ImportError:
+    HAS_FLASK_COMPRESS = False
+
+logger = logging.getLogger(__name__)
+
+ASSETS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+ASSETS_URL = '/assets/'
+
+# asset_url() links carry a hash of the file's content, so browsers may keep
+# them for a year without revalidating
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Dash's own asset links carry the file's mtime (?m=), not its content: a
+# copy or checkout that keeps the mtime serves new content under the old
+# URL. Those are cached for a week and not marked immutable
+MTIME_MAX_AGE = 7 * 24 * 3600
+
+COMPRESS_MIMETYPES = [
+    'application/json',
+    'text/html',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon',
+]
+
+
+@lru_cache(maxsize=None)
+def _content_hash(filepath, mtime_ns):
+    return file_sha256(filepath)[:12]
+
+
+def asset_url(path):
+    """
+    URL of a file in assets/ carrying a hash of its content, so the response
+    can be cached as immutable and still changes whenever the file does.
+    """
+    filepath = os.path.join(ASSETS_FOLDER, path)
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
+        return f"{ASSETS_URL}{path}"
+    return f"{ASSETS_URL}{path}?v={_content_hash(filepath, mtime_ns)}"
+
+
+def _set_cache_headers(response):
+    if request.path.startswith(ASSETS_URL) and response.status_code in (200, 304):
+        # asset_url() adds ?v=<content hash>; Dash stamps its links with ?m=<mtime>
+        if 'v' in request.args:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        elif 'm' in request.args:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = MTIME_MAX_AGE
+        else:
+            response.cache_control.no_cache = True
+    return response
+
+
+def _check_admin_token():
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(supplied.encode('utf-8'), config.ADMIN_TOKEN.encode('utf-8')):
+        abort(403)
+
+
+def _reload_dataset():
+    _check_admin_token()
+    handle = get_dataset_handle()
+
+    # Only this worker answers the request. The others reload through their
+    # watchers, so bump the file's mtime for them to see; this worker then
+    # records the new mtime and its own watcher leaves it alone.
+    reloaded = 'this process'
+    if config.RELOAD_INTERVAL:
+        try:
+            os.utime(handle.path)
+            reloaded = 'all workers'
+        except OSError as e:
+            logger.warning("Could not touch %s to reload the other workers: %s", handle.path, e)
+
+    try:
+        info = handle.reload()
+    except Exception as e:
+        logger.exception("Dataset reload requested through the admin endpoint failed")
+        return jsonify(error=str(e), version=handle.version), 500
+    return jsonify(dict(info, reloaded=reloaded, pid=os.getpid()))
+
+
+def _admin_stats():
+    _check_admin_token()
+    return jsonify(
+        pid=os.getpid(),
+        dataset=get_dataset_stats(),
+        # Filtered views shared by the callbacks reacting to one filter change
+        filter_views=get_view_cache_stats(),
+        # Serialized figures, bounded by figure_cache.FIGURE_CACHE_BYTES
+        figures=get_figure_cache_stats(),
+    )
+
+
+def configure_server(app):
+    """
+    Response compression, asset caching and (with AEID_ADMIN_TOKEN set) the
+    admin endpoints for the Flask server behind `app`.
+    GET /admin/stats reports the dataset load figures and cache counters of
+    the worker that answers it. POST /admin/reload-dataset reloads that
+    worker at once and, when AEID_RELOAD_INTERVAL runs the watchers, every
+    other worker within two intervals; its `reloaded` field says which.
+    """
+    server = app.server
+
+    if HAS_FLASK_COMPRESS:
+        server.config.update(
+            COMPRESS_ALGORITHM=['br', 'gzip'],
+            # Assets are sent as streamed responses, which flask-compress
+            # encodes from this list; its default has no gzip
+            COMPRESS_ALGORITHM_STREAMING=['br', 'gzip'],
+            COMPRESS_MIMETYPES=COMPRESS_MIMETYPES,
+            COMPRESS_MIN_SIZE=config.COMPRESS_MIN_BYTES,
+        )
+        Compress(server)
+
+    server.after_request(_set_cache_headers)
+
+    if config.ADMIN_TOKEN:
+        server.add_url_rule('/admin/reload-dataset', 'reload_dataset', _reload_dataset, methods=['POST'])
+        server.add_url_rule('/admin/stats', 'admin_stats', _admin_stats, methods=['GET'])
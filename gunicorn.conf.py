@@ -0,0 +1,52 @@
+"""
+Gunicorn settings for production: the app, dataset and all derived indexes
+are built once in the master process and shared with every worker.
+
+    gunicorn app:server                      # this file is read from the working directory
+    WEB_CONCURRENCY=16 gunicorn app:server
+
+With preload_app the master imports `app`, which loads the dataset and
+prepares its filter index, cube and subsets; with AEID_WARMUP, when_ready
+then fills the layout and figure caches. Workers are forked from it and
+share those pages copy-on-write. The data itself sits in NumPy and Arrow
+buffers (categorical codes, numeric columns) that reference counting never
+writes to. gc.freeze() moves the objects that exist at fork time out of the
+collector's reach, so garbage collections in the workers don't write to
+their headers and un-share the pages holding them.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+preload_app = True
+timeout = 120
+
+
+def when_ready(server):
+    # Runs in the master after the app (and the dataset) is loaded, before the
+    # first fork. The warm-up runs here, once, rather than in every process
+    # that imports `app`; workers inherit the warmed caches, and no thread
+    # holding a cache lock is forked. Without preload_app the master has no
+    # app to warm and the workers start cold.
+    from components import config
+
+    if server.cfg.preload_app and config.WARMUP:
+        from app import app
+        from components.helpers.warmup import run_warmup
+
+        run_warmup(app, config.WARMUP_STATES)
+    gc.collect()
+    gc.freeze()
+    server.log.info("Froze %d objects before forking workers", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork, and the master doesn't serve: each worker
+    # watches the dataset file itself. app.py starts no watcher on import
+    from components import config
+    from components.helpers.dataset import get_dataset_handle
+
+    if config.RELOAD_INTERVAL:
+        get_dataset_handle().start_watcher(config.RELOAD_INTERVAL)
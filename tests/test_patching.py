@@ -0,0 +1,44 @@
+import plotly.graph_objects as go
+from dash import Patch, no_update
+from plotly.io.json import to_json_plotly
+
+from components.helpers.patching import patch_figure
+
+
+def line_figure(years, kind='scatter'):
+    # Built like the app's charts: a full template plus the trace
+    trace = {'type': kind, 'name': 'Nitrogen', 'x': years, 'y': [float(year % 7) for year in years]}
+    return go.Figure(trace, layout={'title': {'text': 'Trend'}, 'template': 'plotly_dark'}).to_plotly_json()
+
+
+def make_callback():
+    @patch_figure()
+    def update(first_year, bars=False):
+        return line_figure(list(range(first_year, 2021)), 'bar' if bars else 'scatter')
+    return update
+
+
+def test_first_call_sends_full_figure_and_signature():
+    figure, signature = make_callback()(1990, False, None)
+    assert isinstance(figure, dict) and figure['data'][0]['x'][0] == 1990
+    assert isinstance(signature, str)
+
+
+def test_unchanged_structure_sends_smaller_patch():
+    update = make_callback()
+    _, signature = update(1990, False, None)
+    patch, new_signature = update(1995, False, signature)
+
+    assert isinstance(patch, Patch)
+    assert new_signature is no_update
+    full = line_figure(list(range(1995, 2021)))
+    assert len(to_json_plotly(patch.to_plotly_json())) * 5 < len(to_json_plotly(full))
+
+
+def test_structure_change_sends_full_figure():
+    update = make_callback()
+    _, signature = update(1990, False, None)
+    figure, new_signature = update(1995, True, signature)
+
+    assert isinstance(figure, dict) and figure['data'][0]['type'] == 'bar'
+    assert new_signature != signature